@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Script to drop contacts a coordinator already has from generated VCF files.
+
+The coordinator's phone export is read once into a Bloom filter plus a sorted
+array of national numbers. Most generated contacts are new, and the Bloom
+filter rejects those without touching the array; the few that hit it are
+confirmed with a binary search, so there are no false matches. Numbers are
+kept as 8-byte integers, so even very large address books stay small.
+
+Usage:
+    python address_book_dedup.py my_phone_export.vcf contacts_group_*.vcf [--output-dir new_contacts]
+"""
+
+import argparse
+import hashlib
+import math
+import os
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from itertools import islice
+
+from csv_sniff import open_text
+from phone_plan import national_number
+
+# Numbers sorted at a time; only one chunk is ever a Python list
+SORT_CHUNK = 1 << 16
+
+def sorted_unique(numbers, chunk_size=SORT_CHUNK):
+    """Return the distinct numbers as a sorted array('Q').
+
+    Sorts bounded chunks into arrays and merges them, so peak memory stays
+    near 8 bytes per number plus one chunk.
+    """
+    numbers = iter(numbers)
+    runs = []
+    while True:
+        chunk = sorted(islice(numbers, chunk_size))
+        if not chunk:
+            break
+        runs.append(array('Q', chunk))
+    result = array('Q')
+    for number in merge(*runs):
+        if not result or number != result[-1]:
+            result.append(number)
+    return result
+
+class BloomFilter:
+    """Fixed-size Bloom filter over integers, sized for a target false-positive rate."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.to_bytes(8, 'little'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+class KnownNumbers:
+    """Bloom filter plus exact sorted index of the numbers in an address book."""
+
+    def __init__(self, numbers, error_rate=0.01):
+        self.numbers = sorted_unique(numbers)
+        self.bloom = BloomFilter(len(self.numbers), error_rate)
+        for number in self.numbers:
+            self.bloom.add(number)
+
+    @classmethod
+    def from_vcf(cls, path, error_rate=0.01):
+        return cls((key for _, keys in iter_vcards(path) for key in keys), error_rate)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __contains__(self, number):
+        if number not in self.bloom:
+            return False
+        i = bisect_left(self.numbers, number)
+        return i < len(self.numbers) and self.numbers[i] == number
+
+    def memory_bytes(self):
+        return self.numbers.itemsize * len(self.numbers) + len(self.bloom.bits)
+
+def phone_key(phone):
+    """Integer key of a phone number (its national number), or None if invalid."""
+    nsn, _ = national_number(phone)
+    return int(nsn) if nsn else None
+
+def iter_vcards(path):
+    """Yield (card_text, [phone keys]) for every vCard in a file, streaming."""
+    card = []
+    with open_text(path) as f:
+        for line in f:
+            # Folded lines (RFC 6350) continue the previous property
+            if line[:1] in (' ', '\t') and card:
+                card[-1] = card[-1].rstrip('\r\n') + line[1:]
+                continue
+            card.append(line)
+            if line.strip().upper() == 'END:VCARD':
+                keys = []
+                for prop in card:
+                    name, _, value = prop.partition(':')
+                    # TEL, TEL;TYPE=CELL, item1.TEL, ...
+                    if name.split(';')[0].split('.')[-1].upper() == 'TEL':
+                        key = phone_key(value.strip().replace('tel:', ''))
+                        if key is not None:
+                            keys.append(key)
+                yield ''.join(card), keys
+                card = []
+
+def filter_vcf(path, known, output_path):
+    """Write the cards of path whose numbers are all unknown; return (kept, dropped)."""
+    kept = dropped = 0
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for card, keys in iter_vcards(path):
+            if any(key in known for key in keys):
+                dropped += 1
+                continue
+            out.write(card)
+            kept += 1
+    return kept, dropped
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('export', help="Coordinator's existing address book export (VCF)")
+    parser.add_argument('vcf_files', nargs='+', help='Generated VCF files to filter')
+    parser.add_argument('--output-dir', default='new_contacts')
+    parser.add_argument('--error-rate', type=float, default=0.01, help='Bloom filter false-positive rate')
+    args = parser.parse_args()
+
+    known = KnownNumbers.from_vcf(args.export, args.error_rate)
+    print(f"Loaded {len(known)} known numbers from {args.export} "
+          f"({known.memory_bytes() / 1024:.1f} KiB index)")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    total_kept = total_dropped = 0
+    for path in args.vcf_files:
+        output_path = os.path.join(args.output_dir, os.path.basename(path))
+        kept, dropped = filter_vcf(path, known, output_path)
+        total_kept += kept
+        total_dropped += dropped
+        print(f"Created {output_path} with {kept} new contacts ({dropped} already known)")
+
+    print(f"\n✅ {total_kept} new contacts, {total_dropped} already in the address book")
+
+if __name__ == '__main__':
+    main()
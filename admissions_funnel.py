@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Script to report the admissions funnel: how many scheduled applicants were
+completed, accepted, rejected or no-shows, overall and per audition day.
+Applicants with a decision but no appointment in the exports are reported
+on a separate line and kept out of the funnel rates.
+
+Joins three sources on the applicant's national phone number:
+  - the appointment exports (appointments_*.csv) for the audition day,
+  - the status / final_decision list parsed by create_rejected_vcf.py
+    (or the appointments in the contact store with --store),
+  - accepted_list_decision.csv for the final accepted list.
+
+The join result is kept as parallel integer columns (day code, outcome code),
+so each table is a single Counter over zipped columns rather than a Python
+loop with branching per applicant.
+
+Usage:
+    python admissions_funnel.py [--store contacts_store.jsonl] [--csv funnel_by_day.csv]
+"""
+
+import argparse
+import csv
+import glob
+import time
+from array import array
+from collections import Counter
+
+from contact_store import ContactStore, normalize_phone
+from contact_table import phone_to_int
+from csv_sniff import open_csv
+from season_batch import merge_season, parse_export
+
+OUTCOMES = ['accepted', 'rejected', 'no_show', 'completed', 'cancelled', 'scheduled']
+UNKNOWN_DAY = 'unscheduled'
+
+def phone_key(phone):
+    """Join key: the national number, or the normalized text for invalid numbers."""
+    return phone_to_int(phone) or normalize_phone(phone)
+
+def classify_outcome(status, final_decision, accepted):
+    """Reduce status, final decision and accepted-list membership to one outcome."""
+    status = (status or '').lower()
+    final_decision = (final_decision or '').lower()
+    if accepted or final_decision == 'accepted':
+        return 'accepted'
+    if status == 'no_show':
+        return 'no_show'
+    if final_decision == 'rejected':
+        return 'rejected'
+    if status in ('completed', 'cancelled'):
+        return status
+    return 'scheduled'
+
+def load_decisions(store_file=None):
+    """Return {phone key: (status, final_decision)}."""
+    decisions = {}
+    if store_file:
+        for record in ContactStore(store_file).contacts('appointments'):
+            decisions[phone_key(record['phone'])] = (record.get('status'), record.get('final_decision'))
+    else:
+        from create_rejected_vcf import data, parse_entries
+
+        for _, phone, status, final_decision in parse_entries(data):
+            key = phone_key(phone)
+            # A later line for the same applicant (e.g. rescheduled) wins unless it is less final
+            if key not in decisions or status != 'scheduled':
+                decisions[key] = (status, final_decision)
+    return decisions
+
+def load_accepted(csv_file):
+    """Return the phone keys of the accepted list."""
+    with open_csv(csv_file) as reader:
+        return {phone_key(row['applicant_phone']) for row in reader if row.get('applicant_phone', '').strip()}
+
+def build_columns(days_by_key, decisions, accepted):
+    """Join the sources into (keys, day list, day codes, outcome codes) columns."""
+    keys = sorted(set(days_by_key) | set(decisions), key=str)
+    days = sorted(set(days_by_key.values())) + [UNKNOWN_DAY]
+    day_index = {day: i for i, day in enumerate(days)}
+    outcome_index = {outcome: i for i, outcome in enumerate(OUTCOMES)}
+
+    day_codes = array('H', (day_index[days_by_key.get(k, UNKNOWN_DAY)] for k in keys))
+    outcome_codes = array('B', (outcome_index[classify_outcome(*decisions.get(k, ('scheduled', '')), k in accepted)]
+                                for k in keys))
+    return keys, days, day_codes, outcome_codes
+
+def funnel_tables(days, day_codes, outcome_codes):
+    """Group-by over the code columns.
+
+    Returns (funnel over scheduled applicants, per-day rows, row for applicants
+    that only appear in the decisions). The last day is UNKNOWN_DAY.
+    """
+    per_day = Counter(zip(day_codes, outcome_codes))
+    unscheduled = len(days) - 1
+    overall = Counter()
+    for (d, o), n in per_day.items():
+        if d != unscheduled:
+            overall[o] += n
+
+    def row(label, counts):
+        total = sum(counts.values())
+        values = {outcome: counts.get(i, 0) for i, outcome in enumerate(OUTCOMES)}
+        attended = values['accepted'] + values['rejected'] + values['completed']
+        return {
+            'day': label,
+            'total': total,
+            **values,
+            'attendance_rate': attended / total if total else 0.0,
+            'acceptance_rate': values['accepted'] / attended if attended else 0.0,
+        }
+
+    by_day = []
+    for d, day in enumerate(days[:-1]):
+        counts = {o: n for (dc, o), n in per_day.items() if dc == d}
+        if counts:
+            by_day.append(row(day, counts))
+    decisions_only = row(UNKNOWN_DAY, {o: n for (dc, o), n in per_day.items() if dc == unscheduled})
+    return row('all_scheduled', overall), by_day, decisions_only
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--appointments', default='appointments_*.csv')
+    parser.add_argument('--accepted', default='accepted_list_decision.csv')
+    parser.add_argument('--store', help='Take status/final_decision from this contact store')
+    parser.add_argument('--csv', help='Also write the per-day table to this CSV')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    files = sorted(p for p in glob.glob(args.appointments) if not p.endswith('_season.csv'))
+    season, _, _ = merge_season([parse_export(p) for p in files])
+    days_by_key = {phone_key(row['applicant_phone']): row['scheduled_date'] for row in season}
+    decisions = load_decisions(args.store)
+    accepted = load_accepted(args.accepted)
+
+    keys, days, day_codes, outcome_codes = build_columns(days_by_key, decisions, accepted)
+    overall, by_day, decisions_only = funnel_tables(days, day_codes, outcome_codes)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print("ADMISSIONS FUNNEL:")
+    print("=" * 80)
+    print(f"Applicants scheduled (in the appointment exports): {overall['total']}")
+    for outcome in OUTCOMES:
+        if overall[outcome]:
+            print(f"  {outcome:10s}: {overall[outcome]:5d} ({overall[outcome] / overall['total']:.0%})")
+    print(f"Attendance rate: {overall['attendance_rate']:.0%}")
+    print(f"Acceptance rate (of attended): {overall['acceptance_rate']:.0%}")
+    if decisions_only['total']:
+        breakdown = ', '.join(f"{o} {decisions_only[o]}" for o in OUTCOMES if decisions_only[o])
+        print(f"\nNot in any appointment export (decisions only): {decisions_only['total']} ({breakdown})")
+
+    print("\n" + "=" * 80)
+    print("PER DAY:")
+    print("=" * 80)
+    header = f"{'day':12s} {'total':>6s} " + ' '.join(f'{o[:9]:>9s}' for o in OUTCOMES) + f" {'attend':>7s} {'accept':>7s}"
+    print(header)
+    for r in by_day:
+        print(f"{r['day']:12s} {r['total']:6d} " + ' '.join(f'{r[o]:9d}' for o in OUTCOMES)
+              + f" {r['attendance_rate']:7.0%} {r['acceptance_rate']:7.0%}")
+
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(overall))
+            writer.writeheader()
+            writer.writerows(by_day + [overall, decisions_only])
+        print(f"\n✅ Created {args.csv}")
+
+    print(f"\nJoined {len(keys)} applicants in {elapsed * 1000:.0f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,10 @@
 Script to analyze CSV and identify all contacts, including multiline entries.
 """
 
-import csv
 import re
 
+from csv_sniff import open_csv, open_text
+
 def main():
     csv_file = 'accepted_list.csv'
     
@@ -14,8 +15,7 @@ def main():
     skipped = []
     
     # Method 1: Standard CSV reader
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open_csv(csv_file) as reader:
         for idx, row in enumerate(reader, start=2):  # Start at 2 because line 1 is header
             name = row.get('applicant_name', '').strip()
             phone = row.get('applicant_phone', '').strip()
@@ -36,7 +36,7 @@ def main():
     
     # Method 2: Manual line-by-line parsing to catch multiline entries
     all_lines = []
-    with open(csv_file, 'r', encoding='utf-8') as f:
+    with open_text(csv_file) as f:
         lines = f.readlines()
         print(f"\nTotal lines in file: {len(lines)}")
         print(f"Header line: {lines[0].strip()}")
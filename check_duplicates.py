@@ -3,8 +3,10 @@
 Script to check for duplicates and contacts with multiple phone numbers.
 """
 
-import csv
-from collections import defaultdict
+import argparse
+
+from contact_table import ContactTable
+from report_writer import ReportWriter
 
 def normalize_phone(phone):
     """Normalize phone number for comparison."""
@@ -21,73 +23,107 @@ def normalize_phone(phone):
         return phone[1:]  # Remove leading 0
     return phone
 
-def main():
-    csv_file = 'accepted_list_decision.csv'
-    
-    # Track by name and phone
-    contacts_by_name = defaultdict(list)
-    contacts_by_phone = defaultdict(list)
-    all_contacts = []
-    
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (after header)
-            name = row.get('applicant_name', '').strip().strip('"\'')
-            phone = row.get('applicant_phone', '').strip().strip('"\'')
-            
-            if name and phone:
-                normalized_phone = normalize_phone(phone)
-                contacts_by_name[name].append((row_num, phone, normalized_phone))
-                contacts_by_phone[normalized_phone].append((row_num, name))
-                all_contacts.append((row_num, name, phone, normalized_phone))
-    
-    print(f"Total contacts: {len(all_contacts)}\n")
-    
+def print_duplicates(contacts, comparable_phone):
+    """Print every duplicate group; return (duplicate names, duplicate phones)."""
     # Check for duplicate names
-    duplicate_names = {name: entries for name, entries in contacts_by_name.items() if len(entries) > 1}
+    duplicate_names = dict(contacts.by_name().duplicates())
     if duplicate_names:
         print("=" * 80)
         print("DUPLICATE NAMES (same name, possibly different phone numbers):")
         print("=" * 80)
-        for name, entries in sorted(duplicate_names.items()):
+        for name, row_ids in sorted(duplicate_names.items()):
             print(f"\nName: {name}")
-            for row_num, phone, norm_phone in entries:
-                print(f"  Row {row_num}: Phone = {phone} (normalized: {norm_phone})")
+            for row_id in row_ids:
+                row = contacts[row_id]
+                print(f"  Row {row.row_num}: Phone = {row.phone} (normalized: {comparable_phone(row_id)})")
             # Check if they have different phone numbers
-            unique_phones = set(norm_phone for _, _, norm_phone in entries)
+            unique_phones = set(contacts.phones[row_id] or comparable_phone(row_id) for row_id in row_ids)
             if len(unique_phones) > 1:
                 print(f"  ⚠️  WARNING: This name has {len(unique_phones)} different phone numbers!")
     else:
         print("✓ No duplicate names found")
     
     # Check for duplicate phone numbers
-    duplicate_phones = {phone: entries for phone, entries in contacts_by_phone.items() if len(entries) > 1}
+    duplicate_phones = {comparable_phone(row_ids[0]): row_ids for _, row_ids in contacts.by_phone().duplicates()}
     if duplicate_phones:
         print("\n" + "=" * 80)
         print("DUPLICATE PHONE NUMBERS (same phone, possibly different names):")
         print("=" * 80)
-        for phone, entries in sorted(duplicate_phones.items()):
+        for phone, row_ids in sorted(duplicate_phones.items()):
             print(f"\nPhone (normalized): {phone}")
-            for row_num, name in entries:
-                print(f"  Row {row_num}: Name = {name}")
+            for row_id in row_ids:
+                print(f"  Row {contacts.row_nums[row_id]}: Name = {contacts.names[row_id]}")
             # Check if they have different names
-            unique_names = set(name for _, name in entries)
+            unique_names = set(contacts.names[row_id] for row_id in row_ids)
             if len(unique_names) > 1:
                 print(f"  ⚠️  WARNING: This phone number has {len(unique_names)} different names!")
     else:
         print("\n✓ No duplicate phone numbers found")
     
+    return len(duplicate_names), len(duplicate_phones)
+
+def report_duplicates(contacts, comparable_phone, report):
+    """Stream duplicate findings into a report; return (duplicate names, duplicate phones)."""
+    duplicate_names = 0
+    for name, row_ids in contacts.by_name().duplicates():
+        duplicate_names += 1
+        for row_id in row_ids:
+            report.add('duplicate_name', name, row=contacts.row_nums[row_id],
+                       phone=contacts.raw_phone(row_id), normalized=comparable_phone(row_id))
+        unique_phones = sorted(set(comparable_phone(row_id) for row_id in row_ids))
+        if len(unique_phones) > 1:
+            report.add('name_with_multiple_phones', name, phones=unique_phones)
+    
+    duplicate_phones = 0
+    for _, row_ids in contacts.by_phone().duplicates():
+        duplicate_phones += 1
+        phone = comparable_phone(row_ids[0])
+        for row_id in row_ids:
+            report.add('duplicate_phone', phone, row=contacts.row_nums[row_id], name=contacts.names[row_id])
+        unique_names = sorted(set(contacts.names[row_id] for row_id in row_ids))
+        if len(unique_names) > 1:
+            report.add('phone_with_multiple_names', phone, names=unique_names)
+    
+    return duplicate_names, duplicate_phones
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('csv_file', nargs='?', default='accepted_list_decision.csv')
+    parser.add_argument('--report', metavar='DIR',
+                        help='Write findings to a JSON Lines + HTML report in DIR instead of printing them')
+    args = parser.parse_args()
+    csv_file = args.csv_file
+    
+    # One columnar table; the name and phone indexes hold row ids into it
+    contacts = ContactTable.from_csv(csv_file)
+    contacts_by_name = contacts.by_name()
+    contacts_by_phone = contacts.by_phone()
+    
+    def comparable_phone(row_id):
+        return normalize_phone(contacts.raw_phone(row_id))
+    
+    print(f"Total contacts: {len(contacts)}\n")
+    
+    if args.report:
+        with ReportWriter(args.report, f'Duplicate check: {csv_file}') as report:
+            num_duplicate_names, num_duplicate_phones = report_duplicates(contacts, comparable_phone, report)
+            report.close(extra={'Total contacts': len(contacts), 'Unique names': len(contacts_by_name),
+                                'Unique phone numbers': len(contacts_by_phone)})
+        print(f"Wrote {report.total} findings to {args.report}/index.html")
+    else:
+        num_duplicate_names, num_duplicate_phones = print_duplicates(contacts, comparable_phone)
+    
     # Summary
     print("\n" + "=" * 80)
     print("SUMMARY:")
     print("=" * 80)
-    print(f"Total contacts: {len(all_contacts)}")
+    print(f"Total contacts: {len(contacts)}")
     print(f"Unique names: {len(contacts_by_name)}")
     print(f"Unique phone numbers: {len(contacts_by_phone)}")
-    print(f"Duplicate names: {len(duplicate_names)}")
-    print(f"Duplicate phone numbers: {len(duplicate_phones)}")
+    print(f"Duplicate names: {num_duplicate_names}")
+    print(f"Duplicate phone numbers: {num_duplicate_phones}")
     
-    if duplicate_names or duplicate_phones:
+    if num_duplicate_names or num_duplicate_phones:
         print("\n⚠️  Issues found that may need attention!")
     else:
         print("\n✓ No duplicates found - all contacts are unique!")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Script to export contacts in several address-book formats in one pass.
+
+Formats are registered in FORMATS by name. Each serializer is opened on its
+own output file and is handed the same contact stream in chunks, so a single
+read of the CSV feeds every requested format. Records are rendered from
+preformatted templates and written with one writelines() call per chunk.
+
+  vcard3   vCard 3.0 (.vcf), same layout as create_complete_vcf.py
+  vcard4   vCard 4.0 (.v4.vcf), TEL as a tel: URI
+  google   Google Contacts import CSV
+  outlook  Outlook import CSV
+  json     JSON array of {name, phone}
+
+Usage:
+    python contact_formats.py accepted_list_decision.csv --formats vcard3 google json [--output-dir exports]
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from contact_store import clean_name, normalize_phone
+from csv_sniff import open_csv
+
+CHUNK_SIZE = 4096
+
+FORMATS = {}
+
+def register(cls):
+    """Class decorator adding a serializer to FORMATS under its name."""
+    FORMATS[cls.name] = cls
+    return cls
+
+def vcard_escape(value):
+    """Escape a vCard text value (RFC 6350 section 3.4)."""
+    return (value.replace('\\', '\\\\').replace(',', '\\,').replace(';', '\\;')
+            .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n'))
+
+def split_name(name):
+    """'Abel Tesfaye Kebede' -> ('Abel', 'Tesfaye Kebede')"""
+    given, _, family = name.partition(' ')
+    return given, family
+
+class Serializer:
+    """Base serializer: writes a header, then each chunk of (name, phone) pairs."""
+
+    name = None
+    extension = None
+    encoding = 'utf-8'
+
+    def __init__(self, f):
+        self.f = f
+
+    def begin(self):
+        pass
+
+    def write_chunk(self, contacts):
+        raise NotImplementedError
+
+    def end(self):
+        pass
+
+@register
+class VCard3(Serializer):
+    name = 'vcard3'
+    extension = '.vcf'
+    template = 'BEGIN:VCARD\nVERSION:3.0\nFN:{}\nTEL;TYPE=CELL:{}\nEND:VCARD\n'
+
+    def write_chunk(self, contacts):
+        template = self.template
+        self.f.writelines([template.format(vcard_escape(name), phone) for name, phone in contacts])
+
+@register
+class VCard4(VCard3):
+    name = 'vcard4'
+    extension = '.v4.vcf'
+    template = 'BEGIN:VCARD\nVERSION:4.0\nFN:{}\nTEL;VALUE=uri;TYPE=cell:tel:{}\nEND:VCARD\n'
+
+class CsvSerializer(Serializer):
+    """CSV formats go through csv.writer for quoting; rows are built per chunk."""
+
+    fieldnames = []
+
+    def begin(self):
+        self.writer = csv.writer(self.f)
+        self.writer.writerow(self.fieldnames)
+
+    def row(self, name, phone):
+        raise NotImplementedError
+
+    def write_chunk(self, contacts):
+        row = self.row
+        self.writer.writerows([row(name, phone) for name, phone in contacts])
+
+@register
+class GoogleCsv(CsvSerializer):
+    name = 'google'
+    extension = '.google.csv'
+    fieldnames = ['Name', 'Given Name', 'Family Name', 'Group Membership', 'Phone 1 - Type', 'Phone 1 - Value']
+
+    def row(self, name, phone):
+        given, family = split_name(name)
+        return [name, given, family, '* myContacts', 'Mobile', phone]
+
+@register
+class OutlookCsv(CsvSerializer):
+    name = 'outlook'
+    extension = '.outlook.csv'
+    # Outlook (and Excel) only detect UTF-8 with a BOM
+    encoding = 'utf-8-sig'
+    fieldnames = ['First Name', 'Last Name', 'Mobile Phone']
+
+    def row(self, name, phone):
+        given, family = split_name(name)
+        return [given, family, phone]
+
+@register
+class JsonArray(Serializer):
+    name = 'json'
+    extension = '.json'
+
+    def begin(self):
+        self.f.write('[')
+        self.separator = '\n  '
+
+    def write_chunk(self, contacts):
+        lines = []
+        for name, phone in contacts:
+            lines.append(self.separator)
+            lines.append(json.dumps({'name': name, 'phone': phone}, ensure_ascii=False))
+            self.separator = ',\n  '
+        self.f.writelines(lines)
+
+    def end(self):
+        self.f.write('\n]\n')
+
+def iter_contacts(csv_file):
+    """Yield cleaned (name, phone) pairs, skipping rows missing either."""
+    with open_csv(csv_file) as reader:
+        for row in reader:
+            name = clean_name(row.get('applicant_name'))
+            phone = row.get('applicant_phone', '').strip()
+            if name and phone:
+                yield name, normalize_phone(phone)
+
+def export(contacts, formats, output_dir='.', basename='contacts', chunk_size=CHUNK_SIZE):
+    """Write the contact stream in every format; return {path: contacts written}."""
+    os.makedirs(output_dir, exist_ok=True)
+    serializers = []
+    try:
+        for fmt in formats:
+            cls = FORMATS[fmt]
+            path = os.path.join(output_dir, basename + cls.extension)
+            f = open(path, 'w', encoding=cls.encoding, newline='')
+            serializer = cls(f)
+            serializer.path = path
+            serializers.append(serializer)
+            serializer.begin()
+
+        total = 0
+        contacts = iter(contacts)
+        while True:
+            chunk = list(islice(contacts, chunk_size))
+            if not chunk:
+                break
+            for serializer in serializers:
+                serializer.write_chunk(chunk)
+            total += len(chunk)
+
+        for serializer in serializers:
+            serializer.end()
+    finally:
+        for serializer in serializers:
+            serializer.f.close()
+    return {serializer.path: total for serializer in serializers}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv_file', nargs='?', default='accepted_list_decision.csv')
+    parser.add_argument('--formats', nargs='+', choices=sorted(FORMATS), default=sorted(FORMATS))
+    parser.add_argument('--output-dir', default='exports')
+    parser.add_argument('--basename', help='Output file name without extension (default: CSV file name)')
+    args = parser.parse_args()
+
+    basename = args.basename or os.path.splitext(os.path.basename(args.csv_file))[0]
+    start = time.perf_counter()
+    written = export(iter_contacts(args.csv_file), args.formats, args.output_dir, basename)
+    elapsed = time.perf_counter() - start
+
+    for path, count in written.items():
+        print(f"✅ Created {path} with {count} contacts")
+    print(f"\nWrote {len(written)} formats in {elapsed * 1000:.0f} ms")
+
+if __name__ == '__main__':
+    main()
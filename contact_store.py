@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Normalized contact store shared by the ingestion and VCF scripts.
+
+Each line of the store is one JSON record holding the source it came from,
+the raw name and phone, the normalized phone and any status fields.
+"""
+
+import json
+import os
+import re
+
+STORE_FILE = 'contacts_store.jsonl'
+
+def normalize_phone(phone):
+    """Normalize phone number to standard format."""
+    # Remove all spaces, dashes, and parentheses
+    phone = re.sub(r'[\s\-\(\)]', '', str(phone))
+
+    # Remove quotes if present
+    phone = phone.strip('"\'')
+
+    # If it starts with +251, keep it
+    if phone.startswith('+251'):
+        return phone
+    # If it starts with 251 (without +), add +
+    elif phone.startswith('251'):
+        return '+' + phone
+    # If it's a 9-digit number starting with 0, replace 0 with +251
+    elif phone.startswith('0') and len(phone) == 10:
+        return '+251' + phone[1:]
+    # If it's a 9-digit number without leading 0, add +251
+    elif len(phone) == 9 and phone.isdigit():
+        return '+251' + phone
+    # If it's a 12-digit number (251 + 9 digits), add +
+    elif len(phone) == 12 and phone.startswith('251'):
+        return '+' + phone
+    # Otherwise, try to add +251 if it looks like a local number
+    elif len(phone) >= 9:
+        # If it doesn't start with +, assume it's local and add +251
+        if not phone.startswith('+'):
+            # Remove leading 0 if present
+            if phone.startswith('0'):
+                phone = phone[1:]
+            return '+251' + phone
+
+    return phone
+
+def clean_name(name):
+    """Clean up name (remove quotes, collapse whitespace and newlines)."""
+    name = str(name or '').strip().strip('"\'')
+    return re.sub(r'\s+', ' ', name)
+
+def make_record(source, item, name_field, phone_field):
+    """Build a store record from one API item, or None if it has no phone."""
+    phone = str(item.get(phone_field) or '').strip()
+    if not phone:
+        return None
+
+    record = {
+        'source': source,
+        'id': item.get('id'),
+        'name': clean_name(item.get(name_field)),
+        'phone': phone,
+        'normalized_phone': normalize_phone(phone),
+    }
+    # Keep the fields the other scripts care about when the API provides them
+    for field in ('status', 'final_decision', 'scheduled_date', 'scheduled_time',
+                  'selected_song', 'additional_song', 'additional_song_singer'):
+        if item.get(field) is not None:
+            record[field] = item[field]
+    return record
+
+class ContactStore:
+    """Append-only JSON Lines file of normalized contact records."""
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+
+    def append(self, records):
+        """Append records and flush them to disk before returning."""
+        lines = [json.dumps(r, ensure_ascii=False) + '\n' for r in records]
+        if not lines:
+            return 0
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(lines)
+
+    def __iter__(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                # A line cut short by an interrupted run has no newline; skip it
+                if not line.endswith('\n'):
+                    break
+                yield json.loads(line)
+
+    def contacts(self, source=None):
+        """Return records for a source, keeping the latest copy of each id."""
+        latest = {}
+        for record in self:
+            if source and record['source'] != source:
+                continue
+            key = (record['source'], record['id'] if record['id'] is not None else record['normalized_phone'])
+            latest[key] = record
+        return list(latest.values())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Compact column-oriented contact table shared by the contact scripts.
+
+Instead of a tuple (or dict) per contact, each field is one column: phones
+are stored as 8-byte integers in an array (with a 1-byte code to rebuild the
+original text), row numbers as 4-byte integers, and names as interned strings
+so repeated values share memory. Indexes map a key to the row ids that have
+it, kept as sorted arrays of row ids rather than a list per key, and rows are
+read back through small __slots__ views. Run this file to compare memory
+against the list-of-tuples layout at a million rows.
+
+Usage:
+    python contact_table.py [--rows 1000000]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+
+from csv_sniff import open_csv
+from phone_plan import national_number
+
+# How the raw phone text is rebuilt from the national number; anything else
+# (spaces, typos, invalid numbers) keeps its raw text in a side dict
+PHONE_FORMATS = ('0{}', '+251{}', '251{}', '{}')
+RAW_FORMAT = 255
+INVALID_KEY_BASE = 10 ** 9
+
+def phone_to_int(phone):
+    """Encode a phone number as an integer: its national number, or 0 if invalid."""
+    nsn, _ = national_number(phone)
+    return int(nsn) if nsn else 0
+
+def int_to_phone(value):
+    """Format an encoded phone number as +251XXXXXXXXX ('' for 0)."""
+    return f'+251{value:09d}' if value else ''
+
+class ContactRow:
+    """Read-only view of one row of a ContactTable."""
+
+    __slots__ = ('_table', 'row_id')
+
+    def __init__(self, table, row_id):
+        self._table = table
+        self.row_id = row_id
+
+    @property
+    def row_num(self):
+        return self._table.row_nums[self.row_id]
+
+    @property
+    def name(self):
+        return self._table.names[self.row_id]
+
+    @property
+    def phone(self):
+        return self._table.raw_phone(self.row_id)
+
+    @property
+    def phone_key(self):
+        return self._table.phones[self.row_id]
+
+    @property
+    def normalized_phone(self):
+        return int_to_phone(self.phone_key) or self.phone
+
+    def __iter__(self):
+        # Unpacks like the (row_num, name, phone, normalized_phone) tuples it replaces
+        return iter((self.row_num, self.name, self.phone, self.normalized_phone))
+
+    def __repr__(self):
+        return f'ContactRow({self.row_num}, {self.name!r}, {self.phone!r})'
+
+class RowIndex:
+    """Read-only {key: row ids} mapping stored as row ids sorted by key.
+
+    Rows with equal keys are consecutive in `order`; `starts` marks where each
+    key's run begins, so the index costs a few bytes per row instead of a
+    dict entry and a list per key.
+    """
+
+    def __init__(self, keys_by_row):
+        self.order = array('I', sorted(range(len(keys_by_row)), key=keys_by_row.__getitem__))
+        self.keys = []
+        self.starts = array('I')
+        previous = object()
+        for i, row_id in enumerate(self.order):
+            key = keys_by_row[row_id]
+            if key != previous:
+                self.keys.append(key)
+                self.starts.append(i)
+                previous = key
+        self.starts.append(len(self.order))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        i = bisect_left(self.keys, key)
+        return i < len(self.keys) and self.keys[i] == key
+
+    def __getitem__(self, key):
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            raise KeyError(key)
+        return self.order[self.starts[i]:self.starts[i + 1]]
+
+    def items(self):
+        """Yield (key, row ids) in key order."""
+        for i, key in enumerate(self.keys):
+            yield key, self.order[self.starts[i]:self.starts[i + 1]]
+
+    def duplicates(self):
+        """Yield (key, row ids) for keys shared by more than one row."""
+        for i, key in enumerate(self.keys):
+            if self.starts[i + 1] - self.starts[i] > 1:
+                yield key, self.order[self.starts[i]:self.starts[i + 1]]
+
+class ContactTable:
+    """Columnar store of (row_num, name, phone) with indexes of row ids."""
+
+    def __init__(self):
+        self.row_nums = array('I')
+        self.phones = array('Q')
+        self.phone_formats = array('B')
+        self.names = []
+        self.odd_phones = {}
+        self._by_name = None
+        self._by_phone = None
+
+    @classmethod
+    def from_csv(cls, csv_file, name_field='applicant_name', phone_field='applicant_phone'):
+        """Load the rows of a CSV that have both a name and a phone."""
+        table = cls()
+        with open_csv(csv_file) as reader:
+            for row_num, row in enumerate(reader, start=2):  # Start at 2 (after header)
+                name = row.get(name_field, '').strip().strip('"\'')
+                phone = row.get(phone_field, '').strip().strip('"\'')
+                if name and phone:
+                    table.append(row_num, name, phone)
+        return table
+
+    def append(self, row_num, name, phone):
+        """Add a row and return its row id."""
+        row_id = len(self.names)
+        key = phone_to_int(phone)
+        digits = f'{key:09d}'
+        for code, fmt in enumerate(PHONE_FORMATS):
+            if key and fmt.format(digits) == phone:
+                break
+        else:
+            code = RAW_FORMAT
+            self.odd_phones[row_id] = phone
+
+        self.row_nums.append(row_num)
+        self.phones.append(key)
+        self.phone_formats.append(code)
+        self.names.append(sys.intern(name))
+        self._by_name = self._by_phone = None
+        return row_id
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, row_id):
+        if not 0 <= row_id < len(self.names):
+            raise IndexError(row_id)
+        return ContactRow(self, row_id)
+
+    def __iter__(self):
+        return (ContactRow(self, i) for i in range(len(self.names)))
+
+    def raw_phone(self, row_id):
+        """The phone exactly as it appeared in the input."""
+        code = self.phone_formats[row_id]
+        if code == RAW_FORMAT:
+            return self.odd_phones[row_id]
+        return PHONE_FORMATS[code].format(f'{self.phones[row_id]:09d}')
+
+    def phone_keys(self):
+        """Integer key per row for grouping by phone.
+
+        Valid numbers use their national number; each distinct invalid text
+        gets its own id above the national number range.
+        """
+        keys = array('Q', self.phones)
+        odd_ids = {}
+        for row_id, phone in self.odd_phones.items():
+            if not keys[row_id]:
+                keys[row_id] = odd_ids.setdefault(phone, INVALID_KEY_BASE + len(odd_ids))
+        return keys
+
+    def by_name(self):
+        """Return a RowIndex of name -> row ids."""
+        if self._by_name is None:
+            self._by_name = RowIndex(self.names)
+        return self._by_name
+
+    def by_phone(self):
+        """Return a RowIndex of phone key -> row ids."""
+        if self._by_phone is None:
+            self._by_phone = RowIndex(self.phone_keys())
+        return self._by_phone
+
+def synthetic_rows(count):
+    """Yield (row_num, name, phone) rows with realistic repetition of names."""
+    first = ['Abel', 'Bereket', 'Eden', 'Hana', 'Kaleb', 'Lidiya', 'Mihret', 'Natnael', 'Ruth', 'Selam']
+    last = ['Abebe', 'Alemu', 'Desta', 'Getachew', 'Haile', 'Kebede', 'Mesfin', 'Tesfaye', 'Tilahun', 'Yohannes']
+    for i in range(count):
+        name = f'{first[i % 10]} {last[(i // 10) % 10]} {i % 997}'
+        yield i + 2, name, f'09{(i * 7919) % 100000000:08d}'
+
+def measure(build, count):
+    """Return (retained bytes, peak bytes, seconds) for building `count` rows."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(count)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak, elapsed
+
+def build_tuples(count):
+    """The current layout of check_duplicates.py: a tuple per row plus two indexes."""
+    from check_duplicates import normalize_phone
+
+    all_contacts, by_name, by_phone = [], {}, {}
+    for row_num, name, phone in synthetic_rows(count):
+        normalized = normalize_phone(phone)
+        by_name.setdefault(name, []).append((row_num, phone, normalized))
+        by_phone.setdefault(normalized, []).append((row_num, name))
+        all_contacts.append((row_num, name, phone, normalized))
+    return all_contacts, by_name, by_phone
+
+def build_table(count):
+    table = ContactTable()
+    for row_num, name, phone in synthetic_rows(count):
+        table.append(row_num, name, phone)
+    table.by_name()
+    table.by_phone()
+    return table
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(f"Building {args.rows:,} rows with name and phone indexes...\n")
+    results = {}
+    for label, build in (('list of tuples', build_tuples), ('ContactTable', build_table)):
+        retained, peak, elapsed = measure(build, args.rows)
+        results[label] = retained
+        print(f"{label:15s}: {retained / args.rows:6.1f} bytes/row retained "
+              f"({retained / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB), {elapsed:.2f}s")
+
+    saved = 1 - results['ContactTable'] / results['list of tuples']
+    print(f"\n✅ ContactTable uses {saved:.0%} less memory per row")
+
+if __name__ == '__main__':
+    main()
@@ -4,9 +4,12 @@ Script to create a single VCF file from CSV with all contacts.
 Includes detailed reporting to identify any missing entries.
 """
 
-import csv
 import re
 
+from contact_formats import vcard_escape
+from csv_sniff import open_csv
+from phone_plan import classify
+
 def normalize_phone(phone):
     """Normalize phone number to standard format."""
     # Remove all spaces, dashes, and parentheses
@@ -48,6 +51,9 @@ def create_vcf_entry(name, phone):
     # Replace newlines in name with spaces
     name = re.sub(r'\s+', ' ', name)
     
+    # Escape commas, semicolons and backslashes in the vCard text value
+    name = vcard_escape(name)
+    
     # Normalize phone
     phone = normalize_phone(phone)
     
@@ -69,8 +75,7 @@ def main():
     skipped = []
     row_num = 0
     
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open_csv(csv_file) as reader:
         for row in reader:
             row_num += 1
             name = row.get('applicant_name', '').strip()
@@ -89,6 +94,14 @@ def main():
         for row_num, name, phone in skipped:
             print(f"  Row {row_num}: name='{name}', phone='{phone}'")
     
+    # Flag numbers that do not fit the Ethiopian numbering plan
+    invalid = [(name, phone, classify(phone)) for name, phone in contacts]
+    invalid = [(name, phone, info.reason) for name, phone, info in invalid if not info.valid]
+    if invalid:
+        print(f"\n⚠️  {len(invalid)} phone numbers are not valid Ethiopian numbers:")
+        for name, phone, reason in invalid:
+            print(f"  {name}: '{phone}' ({reason})")
+    
     print(f"\nExpected: 158 contacts")
     print(f"Found: {len(contacts)} contacts")
     print(f"Difference: {158 - len(contacts)} contacts")
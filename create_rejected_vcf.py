@@ -5,6 +5,8 @@ Script to create VCF file for scheduled and rejected contacts with Rej_ prefix.
 
 import re
 
+from contact_formats import vcard_escape
+
 def normalize_phone(phone):
     """Normalize phone number to standard format."""
     # Remove all spaces, dashes, and parentheses
@@ -49,6 +51,9 @@ def create_vcf_entry(name, phone):
     # Add Rej_ prefix
     name = f"Rej_{name}"
     
+    # Escape commas, semicolons and backslashes in the vCard text value
+    name = vcard_escape(name)
+    
     # Normalize phone
     phone = normalize_phone(phone)
     
@@ -428,11 +433,9 @@ Mihiret mulugeta|0921236417|scheduled|
 NETSANET TESFAYE GIZAW|251980159501|no_show|rejected
 Helina Tadesse|0911689998|completed|"""
 
-def main():
-    output_file = 'rejected_only_contact.vcf'
-    rejected_contacts = []
-    
-    # Parse the data - handle multiline entries
+def parse_entries(data):
+    """Parse name|phone|status|final_decision lines, joining multiline names."""
+    entries = []
     lines = data.strip().split('\n')
     i = 0
     current_name_parts = []
@@ -459,16 +462,25 @@ def main():
                 else:
                     name = name_part
                 
-                # Check if final_decision is "rejected" (must be in the final_decision field)
-                final_decision_lower = final_decision.lower()
-                if phone and final_decision_lower == 'rejected':
-                    rejected_contacts.append((name, phone))
+                entries.append((name, phone, status, final_decision))
         else:
             # Line without pipe - continuation of name
             current_name_parts.append(line)
         
         i += 1
     
+    return entries
+
+def main():
+    output_file = 'rejected_only_contact.vcf'
+    rejected_contacts = []
+    
+    for name, phone, status, final_decision in parse_entries(data):
+        # Check if final_decision is "rejected" (must be in the final_decision field)
+        final_decision_lower = final_decision.lower()
+        if phone and final_decision_lower == 'rejected':
+            rejected_contacts.append((name, phone))
+    
     # Remove duplicates based on phone number
     seen_phones = set()
     unique_rejected = []
@@ -3,9 +3,11 @@
 Script to create a single VCF file from CSV with all contacts.
 """
 
-import csv
 import re
 
+from contact_formats import vcard_escape
+from csv_sniff import open_csv
+
 def normalize_phone(phone):
     """Normalize phone number to standard format."""
     # Remove all spaces, dashes, and parentheses
@@ -47,6 +49,9 @@ def create_vcf_entry(name, phone):
     # Replace newlines in name with spaces
     name = re.sub(r'\s+', ' ', name)
     
+    # Escape commas, semicolons and backslashes in the vCard text value
+    name = vcard_escape(name)
+    
     # Normalize phone
     phone = normalize_phone(phone)
     
@@ -65,8 +70,7 @@ def main():
     
     # Read CSV and create contacts
     contacts = []
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open_csv(csv_file) as reader:
         for row in reader:
             name = row.get('applicant_name', '').strip()
             phone = row.get('applicant_phone', '').strip()
@@ -1,11 +1,25 @@
 #!/usr/bin/env python3
 """
 Script to create VCF files from CSV with groups of 20 contacts per file.
+
+With --zip the groups are streamed straight into a compressed archive instead
+of loose files, together with a manifest.json of contact counts and SHA-256
+hashes per group. With --coordinators the groups are split into consecutive
+blocks, one archive per coordinator.
+
+Usage:
+    python create_vcf_groups.py [--zip contacts_groups.zip] [--coordinators NAME [NAME ...]]
 """
 
-import csv
+import argparse
+import hashlib
+import json
 import re
 import os
+import zipfile
+
+from contact_formats import vcard_escape
+from csv_sniff import open_csv
 
 def normalize_phone(phone):
     """Normalize phone number to standard format."""
@@ -48,6 +62,9 @@ def create_vcf_entry(name, phone):
     # Replace newlines in name with spaces
     name = re.sub(r'\s+', ' ', name)
     
+    # Escape commas, semicolons and backslashes in the vCard text value
+    name = vcard_escape(name)
+    
     # Normalize phone
     phone = normalize_phone(phone)
     
@@ -60,14 +77,10 @@ END:VCARD
 """
     return vcf
 
-def main():
-    csv_file = 'accepted_list.csv'
-    group_size = 20
-    
-    # Read CSV and create contacts
+def read_contacts(csv_file):
+    """Read (name, phone) pairs, skipping rows missing either."""
     contacts = []
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open_csv(csv_file) as reader:
         for row in reader:
             name = row.get('applicant_name', '').strip()
             phone = row.get('applicant_phone', '').strip()
@@ -77,35 +90,110 @@ def main():
                 continue
             
             contacts.append((name, phone))
-    
-    print(f"Found {len(contacts)} contacts")
-    
-    # Create VCF files in groups
+    return contacts
+
+def iter_groups(contacts, group_size):
+    """Yield (vcf filename, contacts, first entry, last entry) per group."""
     num_groups = (len(contacts) + group_size - 1) // group_size  # Ceiling division
-    
     for group_num in range(num_groups):
         start_idx = group_num * group_size
         end_idx = min(start_idx + group_size, len(contacts))
-        group_contacts = contacts[start_idx:end_idx]
+        yield f'contacts_group_{group_num + 1:02d}.vcf', contacts[start_idx:end_idx], start_idx + 1, end_idx
+
+def split_blocks(groups, parts):
+    """Split groups into `parts` consecutive blocks of near-equal size."""
+    size, extra = divmod(len(groups), parts)
+    blocks = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        blocks.append(groups[start:end])
+        start = end
+    return blocks
+
+def write_zip(zip_path, groups, extra_manifest=None):
+    """Stream groups into one ZIP archive and return its manifest.
+
+    Each VCF is written entry by entry into the archive member, hashing the
+    bytes on the way, so no group is held in full or written to disk first.
+    """
+    manifest = dict(extra_manifest or {}, groups=[], contacts=0)
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for vcf_filename, group_contacts, first, last in groups:
+            digest = hashlib.sha256()
+            size = 0
+            with archive.open(vcf_filename, 'w') as member:
+                for name, phone in group_contacts:
+                    data = create_vcf_entry(name, phone).encode('utf-8')
+                    member.write(data)
+                    digest.update(data)
+                    size += len(data)
+            manifest['groups'].append({
+                'file': vcf_filename,
+                'contacts': len(group_contacts),
+                'entries': f'{first}-{last}',
+                'bytes': size,
+                'sha256': digest.hexdigest(),
+            })
+            manifest['contacts'] += len(group_contacts)
+        archive.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2) + '\n')
+    return manifest
+
+def coordinator_zip_path(zip_path, coordinator):
+    """contacts_groups.zip + 'Abel T' -> contacts_groups_abel_t.zip"""
+    base, ext = os.path.splitext(zip_path)
+    slug = re.sub(r'\W+', '_', coordinator.strip().lower()).strip('_') or 'coordinator'
+    return f'{base}_{slug}{ext or ".zip"}'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv_file', nargs='?', default='accepted_list.csv')
+    parser.add_argument('--group-size', type=int, default=20)
+    parser.add_argument('--zip', dest='zip_path', help='Write the groups into this ZIP archive instead of loose files')
+    parser.add_argument('--coordinators', nargs='+', metavar='NAME',
+                        help='With --zip, split the groups into one archive per coordinator')
+    args = parser.parse_args()
+    csv_file = args.csv_file
+    group_size = args.group_size
+    
+    # Read CSV and create contacts
+    contacts = read_contacts(csv_file)
+    
+    print(f"Found {len(contacts)} contacts")
+    
+    groups = list(iter_groups(contacts, group_size))
+    num_groups = len(groups)
+    
+    if args.coordinators and not args.zip_path:
+        parser.error('--coordinators requires --zip')
+    if args.coordinators and len(args.coordinators) > num_groups:
+        parser.error(f'{len(args.coordinators)} coordinators but only {num_groups} groups; '
+                     'pass fewer coordinators or a smaller --group-size')
+    
+    if args.zip_path:
+        if args.coordinators:
+            bundles = [(coordinator_zip_path(args.zip_path, coordinator), block, {'coordinator': coordinator})
+                       for coordinator, block in zip(args.coordinators, split_blocks(groups, len(args.coordinators)))]
+        else:
+            bundles = [(args.zip_path, groups, {})]
         
-        # Create VCF file
-        vcf_filename = f'contacts_group_{group_num + 1:02d}.vcf'
+        for zip_path, block, extra in bundles:
+            manifest = write_zip(zip_path, block, dict(extra, source=csv_file, group_size=group_size))
+            print(f"Created {zip_path} with {len(block)} groups, {manifest['contacts']} contacts")
+        
+        print(f"\nCreated {len(bundles)} ZIP archive(s) with {num_groups} VCF groups in total")
+        return
+    
+    # Create VCF files in groups
+    for vcf_filename, group_contacts, first, last in groups:
         with open(vcf_filename, 'w', encoding='utf-8') as vcf_file:
             for name, phone in group_contacts:
                 vcf_entry = create_vcf_entry(name, phone)
                 vcf_file.write(vcf_entry)
         
-        print(f"Created {vcf_filename} with {len(group_contacts)} contacts (entries {start_idx + 1}-{end_idx})")
+        print(f"Created {vcf_filename} with {len(group_contacts)} contacts (entries {first}-{last})")
     
     print(f"\nCreated {num_groups} VCF files in total")
 
 if __name__ == '__main__':
     main()
-
-
-
-
-
-
-
-
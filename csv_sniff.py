@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Encoding and dialect sniffing for CSV exports, including ones re-saved by Excel.
+
+Excel can save an export as UTF-8 with a BOM, as UTF-16, or with semicolons
+instead of commas. Opened as plain UTF-8, the first header then reads
+'\\ufeffapplicant_name' and row.get('applicant_name') is empty for every row.
+sniff() looks only at a bounded prefix of the file to pick the encoding and
+delimiter, and open_csv() then streams the whole file through one decoder, so
+nothing is decoded twice.
+
+Usage:
+    python csv_sniff.py FILE [FILE ...]
+"""
+
+import argparse
+import codecs
+import csv
+from collections import namedtuple
+from contextlib import contextmanager
+
+SAMPLE_SIZE = 64 * 1024
+DELIMITERS = ',;\t|'
+
+CsvFormat = namedtuple('CsvFormat', 'encoding delimiter bom')
+
+# Longest BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE one
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+def detect_encoding(sample):
+    """Pick an encoding from the first bytes of a file; return (encoding, bom)."""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding, True
+
+    # UTF-16 without a BOM: ASCII text leaves every other byte zero
+    if len(sample) >= 4:
+        even_zeros = sample[0::2].count(0)
+        odd_zeros = sample[1::2].count(0)
+        half = len(sample) // 2
+        if odd_zeros > half * 0.4 and even_zeros < half * 0.1:
+            return 'utf-16-le', False
+        if even_zeros > half * 0.4 and odd_zeros < half * 0.1:
+            return 'utf-16-be', False
+
+    try:
+        # The prefix may end mid-character, so decode it incrementally
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8', False
+    except UnicodeDecodeError:
+        return 'cp1252', False
+
+def detect_delimiter(text):
+    """Pick the delimiter from decoded sample text, defaulting to a comma."""
+    # Only sniff complete lines; the last one may be cut off
+    lines = text.splitlines()
+    if len(lines) > 1:
+        lines = lines[:-1]
+    sample = '\n'.join(lines[:50])
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        header = lines[0] if lines else ''
+        counts = {d: header.count(d) for d in DELIMITERS}
+        best = max(counts, key=counts.get)
+        return best if counts[best] else ','
+
+def sniff(path, sample_size=SAMPLE_SIZE):
+    """Detect the encoding, BOM and delimiter of a CSV file from its first bytes."""
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+    encoding, bom = detect_encoding(sample)
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=False)
+    return CsvFormat(encoding, detect_delimiter(text), bom)
+
+def open_text(path, encoding=None, newline=None):
+    """Open a text file with its detected encoding (BOM stripped)."""
+    if encoding is None:
+        with open(path, 'rb') as f:
+            encoding, _ = detect_encoding(f.read(SAMPLE_SIZE))
+    return open(path, 'r', encoding=encoding, newline=newline)
+
+@contextmanager
+def open_csv(path, **kwargs):
+    """Yield a csv.DictReader configured for the file's encoding and delimiter."""
+    fmt = sniff(path)
+    with open_text(path, fmt.encoding, newline='') as f:
+        reader = csv.DictReader(f, delimiter=fmt.delimiter, **kwargs)
+        # Excel sometimes pads header cells; 'applicant_name ' should still match
+        if reader.fieldnames:
+            reader.fieldnames = [name.strip() for name in reader.fieldnames]
+        yield reader
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='+')
+    args = parser.parse_args()
+
+    for path in args.files:
+        fmt = sniff(path)
+        with open_csv(path) as reader:
+            header = reader.fieldnames
+        print(f"{path}: encoding={fmt.encoding}{' (BOM)' if fmt.bom else ''}, "
+              f"delimiter={fmt.delimiter!r}, columns={header}")
+
+if __name__ == '__main__':
+    main()
@@ -3,30 +3,53 @@
 Detailed analysis of CSV to find all entries.
 """
 
-import csv
+import argparse
 import re
 
+from csv_sniff import open_csv, open_text
+from report_writer import ReportWriter
+
 def main():
-    csv_file = 'accepted_list.csv'
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('csv_file', nargs='?', default='accepted_list.csv')
+    parser.add_argument('--report', metavar='DIR',
+                        help='Write findings to a JSON Lines + HTML report in DIR instead of printing them')
+    args = parser.parse_args()
+    csv_file = args.csv_file
+    report = ReportWriter(args.report, f'Detailed analysis: {csv_file}') if args.report else None
     
-    # Read all lines first
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-        lines = content.split('\n')
+    # Count lines as a stream rather than reading the whole file
+    total_lines = 1
+    non_empty_lines = 0
+    with open_text(csv_file) as f:
+        for line in f:
+            if line.endswith('\n'):
+                total_lines += 1
+            if line.strip():
+                non_empty_lines += 1
     
-    print(f"Total lines in file: {len(lines)}")
-    print(f"Lines with content (non-empty): {len([l for l in lines if l.strip()])}")
+    print(f"Total lines in file: {total_lines}")
+    print(f"Lines with content (non-empty): {non_empty_lines}")
     
     # Try parsing with CSV reader
     contacts = []
+    contacts_found = 0
     row_num = 0
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open_csv(csv_file) as reader:
         for row in reader:
             row_num += 1
             name = row.get('applicant_name', '').strip()
             phone = row.get('applicant_phone', '').strip()
             
+            if report:
+                if not name:
+                    report.add('missing_name', row=row_num, phone=phone)
+                if not phone:
+                    report.add('missing_phone', row=row_num, name=name)
+                if name and phone:
+                    contacts_found += 1
+                continue
+            
             # Check if either is missing
             if not name:
                 print(f"Row {row_num}: Missing name, phone='{phone}'")
@@ -38,6 +61,12 @@ def main():
             else:
                 print(f"Row {row_num}: SKIPPED - name='{name}', phone='{phone}'")
     
+    if report:
+        report.close(extra={'Rows': row_num, 'Contacts found': contacts_found})
+        print(f"\nWrote {report.total} findings to {args.report}/index.html")
+        print(f"Total contacts found: {contacts_found}")
+        return
+    
     print(f"\nTotal contacts found: {len(contacts)}")
     print(f"Expected: 158")
     print(f"Missing: {158 - len(contacts)}")
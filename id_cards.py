@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Script to generate signed QR payloads (and optionally QR images) for the ID
+cards of the whole accepted roster.
+
+Each accepted applicant with a valid number gets one payload:
+
+    <base64url(JSON {"v", "season", "phone", "name"})>.<base64url(HMAC-SHA256)>
+
+signed with QR_SIGNING_SECRET, so a printed card can be checked offline with
+--verify (or verify_payload()) without the roster at hand. The payloads are
+written to payloads.jsonl.
+
+These are not attendance codes. The QR code that the coordinator scanner
+(app/coordinator/qr-scan) syncs to /attendance/sync is issued by the backend
+through /attendance/student/qrcode in a format this repo does not define, and
+the backend does not know QR_SIGNING_SECRET. Cards printed from these payloads
+will not register attendance; use them for roster and identity checks only.
+
+With --render, the QR images are drawn in a process pool (needs the optional
+qrcode[pil] package) and cached as cards/<payload hash>.png: a card whose
+payload did not change is never drawn again, so reprinting after a small
+roster change only renders the changed cards.
+
+Usage:
+    QR_SIGNING_SECRET=... python id_cards.py [accepted_list_decision.csv] [--render [--prune]]
+    QR_SIGNING_SECRET=... python id_cards.py --verify <scanned payload>
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from contact_store import clean_name
+from contact_table import INVALID_KEY_BASE, ContactTable, int_to_phone
+from phone_plan import classify
+
+try:
+    import qrcode
+except ImportError:
+    qrcode = None
+
+PAYLOAD_VERSION = 1
+# Bump when the image settings below change, so cached cards are redrawn
+RENDER_VERSION = 1
+QR_BOX_SIZE = 10
+QR_BORDER = 2
+
+def b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+def b64url_decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+def sign_payload(claims, secret):
+    """Serialize claims canonically and append their HMAC-SHA256 signature."""
+    body = json.dumps(claims, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    signature = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).digest()
+    return f'{b64url(body)}.{b64url(signature)}'
+
+def verify_payload(token, secret):
+    """Return the claims of a payload, or None if it is malformed or not signed with secret."""
+    try:
+        body_part, signature_part = token.split('.')
+        body = b64url_decode(body_part)
+        signature = b64url_decode(signature_part)
+    except ValueError:
+        return None
+    expected = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        return None
+    return json.loads(body)
+
+def build_payloads(table, secret, season):
+    """Yield (phone, name, payload) once per distinct valid number in the table."""
+    for key, row_ids in table.by_phone().items():
+        # Numbers outside the numbering plan cannot be reached or verified
+        if not 0 < key < INVALID_KEY_BASE or not classify(int_to_phone(key)).valid:
+            continue
+        phone = int_to_phone(key)
+        name = clean_name(table.names[row_ids[0]])
+        claims = {'v': PAYLOAD_VERSION, 'season': season, 'phone': phone, 'name': name}
+        yield phone, name, sign_payload(claims, secret)
+
+def card_hash(payload):
+    """Cache key of a card image: its payload plus the render settings."""
+    return hashlib.sha256(f'{RENDER_VERSION}:{payload}'.encode('utf-8')).hexdigest()
+
+def render_card(job):
+    """Draw one QR image (runs in a worker process)."""
+    payload, path = job
+    image = qrcode.make(payload, box_size=QR_BOX_SIZE, border=QR_BORDER,
+                        error_correction=qrcode.constants.ERROR_CORRECT_M)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        image.save(f, format='PNG')
+    os.replace(tmp_path, path)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv_file', nargs='?', default='accepted_list_decision.csv')
+    parser.add_argument('--output-dir', default='id_cards')
+    parser.add_argument('--secret', default=os.environ.get('QR_SIGNING_SECRET'),
+                        help='HMAC secret (default: QR_SIGNING_SECRET env var)')
+    parser.add_argument('--season', default=str(date.today().year))
+    parser.add_argument('--render', action='store_true', help='Also draw QR images (needs qrcode[pil])')
+    parser.add_argument('--workers', type=int, default=None, help='Render processes (default: CPU count)')
+    parser.add_argument('--prune', action='store_true', help='With --render, delete cached cards no longer in the roster')
+    parser.add_argument('--verify', metavar='PAYLOAD', help='Check one scanned payload and print its claims')
+    args = parser.parse_args()
+
+    if not args.secret:
+        parser.error('set QR_SIGNING_SECRET or pass --secret')
+    if args.prune and not args.render:
+        parser.error('--prune only applies with --render')
+
+    if args.verify:
+        claims = verify_payload(args.verify.strip(), args.secret)
+        if claims is None:
+            print("❌ Invalid payload: malformed or not signed with this secret")
+            sys.exit(1)
+        print(f"✅ Valid card: {claims['name']} ({claims['phone']}), season {claims['season']}")
+        return
+    if args.render and qrcode is None:
+        parser.error('--render needs the qrcode package: pip install "qrcode[pil]"')
+
+    start = time.perf_counter()
+    table = ContactTable.from_csv(args.csv_file)
+    cards = list(build_payloads(table, args.secret, args.season))
+    skipped = len(table.by_phone()) - len(cards)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    cards_dir = os.path.join(args.output_dir, 'cards')
+    manifest = {}
+    with open(os.path.join(args.output_dir, 'payloads.jsonl'), 'w', encoding='utf-8') as f:
+        for phone, name, payload in cards:
+            digest = card_hash(payload)
+            manifest[phone] = f'{digest}.png'
+            f.write(json.dumps({'phone': phone, 'name': name, 'payload': payload, 'card': f'{digest}.png'},
+                               ensure_ascii=False) + '\n')
+
+    print(f"Signed {len(cards)} payloads from {args.csv_file}")
+    if skipped:
+        print(f"⚠️  Skipped {skipped} invalid phone numbers (see phone_plan.py)")
+
+    if args.render:
+        os.makedirs(cards_dir, exist_ok=True)
+        jobs = [(payload, os.path.join(cards_dir, manifest[phone])) for phone, _, payload in cards
+                if not os.path.exists(os.path.join(cards_dir, manifest[phone]))]
+        if jobs:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                list(pool.map(render_card, jobs, chunksize=16))
+        print(f"Rendered {len(jobs)} cards, {len(cards) - len(jobs)} unchanged from cache")
+
+        if args.prune:
+            current = set(manifest.values())
+            stale = [name for name in os.listdir(cards_dir) if name.endswith('.png') and name not in current]
+            for name in stale:
+                os.remove(os.path.join(cards_dir, name))
+            print(f"Pruned {len(stale)} stale cards")
+
+    with open(os.path.join(args.output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'season': args.season, 'cards': manifest}, f, ensure_ascii=False, indent=2)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Wrote {args.output_dir}/payloads.jsonl and manifest.json in {elapsed:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Script to pull applicants, decisions and appointments straight from the backend
+API into the normalized contact store, instead of hand-exported CSVs.
+
+Pages are fetched concurrently over a small pool of keep-alive connections and
+each page is appended to the store as soon as it arrives. Completed pages are
+recorded in a checkpoint file so an interrupted run resumes where it stopped.
+The checkpoint also records the page size: resuming an unfinished source
+with a different --page-size starts that source over, since page numbers
+then cover different rows (records already in the store are superseded, as
+the store keeps the latest copy of each id). --restart deletes both the
+checkpoint and the store.
+
+Usage:
+    ADMIN_TOKEN=... python ingest_api.py [--api-url URL] [--source applicants]
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from contact_store import STORE_FILE, ContactStore, make_record
+
+DEFAULT_API_URL = 'https://chenaniah.org/api/v2/api'
+CHECKPOINT_FILE = 'ingest_checkpoint.json'
+
+# source -> (path, response key, name field, phone field)
+ENDPOINTS = {
+    'applicants': ('/submissions', 'submissions', 'name', 'phone'),
+    'decisions': ('/schedule/appointments/verified', 'appointments', 'applicant_name', 'applicant_phone'),
+    'appointments': ('/schedule/appointments', 'appointments', 'applicant_name', 'applicant_phone'),
+}
+
+class HttpError(RuntimeError):
+    """Raised for a non-200 reply; `status` is the HTTP status code."""
+
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+class ConnectionPool:
+    """Fixed-size pool of persistent HTTP(S) connections to one host."""
+
+    def __init__(self, base_url, size=4, token=None, timeout=30, retries=3):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = {'Accept': 'application/json', 'Connection': 'keep-alive'}
+        if token:
+            self.headers['Authorization'] = f'Bearer {token}'
+
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(self._connect())
+
+    def _connect(self):
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, timeout=self.timeout)
+
+    def request_json(self, method, path, params=None, body=None, retries=None):
+        """Send a request and decode the JSON reply, reconnecting and retrying
+        on dropped connections and 5xx responses."""
+        url = self.prefix + path
+        if params:
+            url += '?' + urlencode(params)
+        if retries is None:
+            retries = self.retries
+        headers = dict(self.headers)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+
+        conn = self._idle.get()
+        try:
+            for attempt in range(retries + 1):
+                try:
+                    conn.request(method, url, body=payload, headers=headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                except (http.client.HTTPException, OSError):
+                    # Server closed the keep-alive connection; open a fresh one
+                    conn.close()
+                    conn = self._connect()
+                    if attempt == retries:
+                        raise
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+
+                if response.status >= 500 and attempt < retries:
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                if response.status != 200:
+                    raise HttpError(f'{method} {url} failed with HTTP {response.status}', response.status)
+                return json.loads(data)
+        finally:
+            self._idle.put(conn)
+
+    def get_json(self, path, params=None):
+        """GET a JSON document."""
+        return self.request_json('GET', path, params)
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+def load_checkpoint(path):
+    """Load the per-source checkpoint, or an empty one."""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def save_checkpoint(path, checkpoint):
+    """Write the checkpoint atomically so a crash never leaves it half-written."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+async def ingest_source(source, pool, executor, store, checkpoint, checkpoint_file, page_size):
+    """Fetch every page of one source and stream it into the store."""
+    path, key, name_field, phone_field = ENDPOINTS[source]
+    state = checkpoint.get(source)
+    if state is None or state.get('limit') != page_size:
+        state = checkpoint[source] = {'limit': page_size, 'done_pages': [], 'total_pages': None}
+    done = set(state['done_pages'])
+    loop = asyncio.get_running_loop()
+
+    def fetch(page):
+        return page, pool.get_json(path, {'page': page, 'limit': page_size})
+
+    def record_page(page, data):
+        items = data.get(key) or []
+        records = [make_record(source, item, name_field, phone_field) for item in items]
+        written = store.append([r for r in records if r])
+        done.add(page)
+        state['done_pages'] = sorted(done)
+        save_checkpoint(checkpoint_file, checkpoint)
+        return written
+
+    total = 0
+    # The first page tells us how many pages there are
+    if state['total_pages'] is None or 1 not in done:
+        _, data = await loop.run_in_executor(executor, fetch, 1)
+        pagination = data.get('pagination') or {}
+        state['total_pages'] = pagination.get('total_pages') or 1
+        if 1 not in done:
+            total += record_page(1, data)
+
+    pending = [p for p in range(2, state['total_pages'] + 1) if p not in done]
+    tasks = [loop.run_in_executor(executor, fetch, p) for p in pending]
+    for future in asyncio.as_completed(tasks):
+        page, data = await future
+        total += record_page(page, data)
+
+    state['completed'] = True
+    save_checkpoint(checkpoint_file, checkpoint)
+    return total
+
+async def ingest(sources, api_url, token, store_file, checkpoint_file, workers, page_size):
+    """Ingest the requested sources concurrently over one connection pool."""
+    pool = ConnectionPool(api_url, size=workers, token=token)
+    store = ContactStore(store_file)
+    checkpoint = load_checkpoint(checkpoint_file)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            todo = [s for s in sources if not checkpoint.get(s, {}).get('completed')]
+            counts = await asyncio.gather(*[
+                ingest_source(s, pool, executor, store, checkpoint, checkpoint_file, page_size)
+                for s in todo
+            ])
+    finally:
+        pool.close()
+
+    return dict(zip(todo, counts))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--api-url', default=os.environ.get('NEXT_PUBLIC_API_URL', DEFAULT_API_URL))
+    parser.add_argument('--token', default=os.environ.get('ADMIN_TOKEN'))
+    parser.add_argument('--source', action='append', choices=sorted(ENDPOINTS),
+                        help='Source to ingest (repeatable, default: all)')
+    parser.add_argument('--store', default=STORE_FILE)
+    parser.add_argument('--checkpoint', default=CHECKPOINT_FILE)
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent connections')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--restart', action='store_true',
+                        help='Delete the checkpoint and the store, and fetch everything again')
+    args = parser.parse_args()
+
+    if args.restart:
+        for path in (args.checkpoint, args.store):
+            if os.path.exists(path):
+                os.remove(path)
+
+    sources = args.source or list(ENDPOINTS)
+    start = time.perf_counter()
+    counts = asyncio.run(ingest(sources, args.api_url, args.token, args.store,
+                                args.checkpoint, args.workers, args.page_size))
+    elapsed = time.perf_counter() - start
+
+    for source in sources:
+        if source in counts:
+            print(f"{source}: {counts[source]} records")
+        else:
+            print(f"{source}: already complete (use --restart to fetch again)")
+    print(f"\n✅ Stored contacts in {args.store} in {elapsed:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Script to send decision notifications (SMS) to accepted and rejected applicants.
+
+Contacts are the same normalized, deduplicated set the VCF scripts produce:
+accepted applicants from accepted_list_decision.csv and the rejected ("Rej_")
+applicants parsed by create_rejected_vcf.py, or the decisions pulled into the
+contact store by ingest_api.py. Each contact gets its category's template.
+
+Messages go out concurrently through a gateway adapter, throttled by a token
+bucket and retried with backoff. Every delivered message is recorded in a sent
+log, and contacts already in the log are skipped, so a rerun after a crash or
+partial failure never messages anyone twice. The fake gateway (dry run) reads
+the sent log to report who would be skipped but never writes to it.
+
+Usage:
+    python notify_applicants.py --gateway fake            # dry run
+    ADMIN_TOKEN=... python notify_applicants.py --gateway backend --rate 5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+
+from contact_store import ContactStore, clean_name
+from csv_sniff import open_csv
+from phone_plan import classify
+
+SENT_LOG_FILE = 'notifications_sent.jsonl'
+
+TEMPLATES = {
+    'accepted': ("Dear {name}, congratulations! You have been accepted into the "
+                 "Chenaniah choir. We will contact you with the next steps."),
+    'rejected': ("Dear {name}, thank you for auditioning with Chenaniah. We are "
+                 "unable to offer you a place this season. God bless you."),
+}
+
+class GatewayError(Exception):
+    """Raised by a gateway when a message could not be delivered."""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+class FakeGateway:
+    """In-memory gateway for dry runs: records messages instead of sending them."""
+
+    def __init__(self, latency=0.05, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.sent = []
+        self._random = random.Random(seed)
+
+    async def send(self, phone, message):
+        await asyncio.sleep(self.latency)
+        if self._random.random() < self.failure_rate:
+            raise GatewayError('simulated gateway failure')
+        self.sent.append((phone, message))
+
+class BackendSmsGateway:
+    """Sends through the backend's SMS endpoint (the admin dashboard's test SMS)."""
+
+    def __init__(self, api_url, token, connections=4):
+        from ingest_api import ConnectionPool, HttpError
+
+        self.http_error = HttpError
+        self.pool = ConnectionPool(api_url, size=connections, token=token)
+
+    async def send(self, phone, message):
+        loop = asyncio.get_running_loop()
+        try:
+            # No transport-level retry: the dispatcher decides when to resend
+            data = await loop.run_in_executor(
+                None, lambda: self.pool.request_json(
+                    'POST', '/sms/test', body={'phone': phone, 'message': message}, retries=0))
+        except self.http_error as e:
+            # A 4xx (bad token, bad request) fails the same way every time; 429 is throttling
+            raise GatewayError(str(e), retryable=e.status >= 500 or e.status == 429)
+        except OSError as e:
+            raise GatewayError(str(e))
+        if not data.get('success'):
+            raise GatewayError(data.get('error') or 'gateway rejected the message', retryable=False)
+
+    def close(self):
+        self.pool.close()
+
+class TokenBucket:
+    """Async token bucket allowing `rate` sends per second with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class SentLog:
+    """Append-only log of delivered message keys.
+
+    With read_only=True the log is loaded but deliveries are only remembered
+    in memory, so a dry run never marks anyone as notified.
+    """
+
+    def __init__(self, path=SENT_LOG_FILE, read_only=False):
+        self.path = path
+        self.keys = set()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.endswith('\n'):
+                        # Rebuild the key from category and phone so entries written
+                        # under an older key scheme still count
+                        self.keys.add(message_key(json.loads(line)))
+        self._file = None if read_only else open(path, 'a', encoding='utf-8')
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def record(self, key, contact):
+        """Persist a delivery before it is counted as done."""
+        self.keys.add(key)
+        if self._file is None:
+            return
+        entry = {'key': key, 'category': contact['category'], 'phone': contact['phone'],
+                 'sent_at': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+def message_key(contact):
+    """Stable id for one notification: same person and category.
+
+    The template text is deliberately not part of the key, so fixing a typo
+    in a template does not message everyone again.
+    """
+    raw = f"{contact['category']}|{contact['phone']}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def load_contacts(csv_file, store_file=None, invalid=None):
+    """Return deduplicated {name, phone, category} dicts for every decision.
+
+    Numbers outside the Ethiopian numbering plan are left out (and appended to
+    `invalid` as (name, phone, reason) when a list is given).
+    """
+    contacts = []
+    if store_file:
+        for record in ContactStore(store_file).contacts('decisions'):
+            decision = (record.get('final_decision') or '').lower()
+            if decision in TEMPLATES:
+                contacts.append((record['name'], record['phone'], decision))
+    else:
+        from create_rejected_vcf import data, parse_entries
+
+        with open_csv(csv_file) as reader:
+            for row in reader:
+                name = row.get('applicant_name', '').strip()
+                phone = row.get('applicant_phone', '').strip()
+                if name and phone:
+                    contacts.append((name, phone, 'accepted'))
+        for name, phone, status, final_decision in parse_entries(data):
+            if phone and final_decision.lower() == 'rejected':
+                contacts.append((name, phone, 'rejected'))
+
+    # Remove duplicates based on category and normalized phone
+    seen = set()
+    unique = []
+    for name, phone, category in contacts:
+        info = classify(phone)
+        if not info.valid:
+            if invalid is not None:
+                invalid.append((clean_name(name), phone, info.reason))
+            continue
+        norm_phone = info.e164
+        if (category, norm_phone) not in seen:
+            seen.add((category, norm_phone))
+            unique.append({'name': clean_name(name), 'phone': norm_phone, 'category': category})
+    return unique
+
+async def dispatch(contacts, templates, gateway, sent_log, rate, concurrency, max_attempts=5, backoff=0.5):
+    """Send every pending message and return (sent, skipped, failed) lists."""
+    bucket = TokenBucket(rate)
+    work = asyncio.Queue()
+    sent, skipped, failed = [], [], []
+
+    for contact in contacts:
+        key = message_key(contact)
+        if key in sent_log:
+            skipped.append(contact)
+        else:
+            work.put_nowait((contact, key, templates[contact['category']].format(name=contact['name'])))
+
+    async def worker():
+        while True:
+            try:
+                contact, key, message = work.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            for attempt in range(1, max_attempts + 1):
+                await bucket.acquire()
+                try:
+                    await gateway.send(contact['phone'], message)
+                except GatewayError as e:
+                    if not e.retryable or attempt == max_attempts:
+                        failed.append((contact, str(e)))
+                        break
+                    await asyncio.sleep(min(30, backoff * 2 ** attempt) * random.uniform(0.5, 1.5))
+                else:
+                    sent_log.record(key, contact)
+                    sent.append(contact)
+                    break
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return sent, skipped, failed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default='accepted_list_decision.csv', help='Accepted applicants CSV')
+    parser.add_argument('--store', help='Use decisions from this contact store instead of the CSV')
+    parser.add_argument('--templates', help='JSON file mapping category to message template')
+    parser.add_argument('--category', action='append', choices=sorted(TEMPLATES),
+                        help='Only notify this category (repeatable)')
+    parser.add_argument('--gateway', choices=['fake', 'backend'], default='fake')
+    parser.add_argument('--api-url', default=os.environ.get('NEXT_PUBLIC_API_URL', 'https://chenaniah.org/api/v2/api'))
+    parser.add_argument('--token', default=os.environ.get('ADMIN_TOKEN'))
+    parser.add_argument('--rate', type=float, default=10, help='Messages per second')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--sent-log', default=SENT_LOG_FILE)
+    args = parser.parse_args()
+
+    templates = dict(TEMPLATES)
+    if args.templates:
+        with open(args.templates, 'r', encoding='utf-8') as f:
+            templates.update(json.load(f))
+
+    invalid = []
+    contacts = load_contacts(args.csv, args.store, invalid)
+    if args.category:
+        contacts = [c for c in contacts if c['category'] in args.category]
+    print(f"Loaded {len(contacts)} contacts")
+    if invalid:
+        print(f"⚠️  Skipping {len(invalid)} invalid numbers:")
+        for name, phone, reason in invalid:
+            print(f"  {name}: '{phone}' ({reason})")
+
+    if args.gateway == 'backend':
+        gateway = BackendSmsGateway(args.api_url, args.token, connections=args.concurrency)
+    else:
+        gateway = FakeGateway()
+        print("Dry run: messages are not sent and the sent log is not updated")
+    sent_log = SentLog(args.sent_log, read_only=args.gateway == 'fake')
+
+    start = time.perf_counter()
+    try:
+        sent, skipped, failed = asyncio.run(
+            dispatch(contacts, templates, gateway, sent_log, args.rate, args.concurrency))
+    finally:
+        sent_log.close()
+        if hasattr(gateway, 'close'):
+            gateway.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"Sent: {len(sent)}")
+    print(f"Skipped (already sent): {len(skipped)}")
+    if failed:
+        print(f"\n⚠️  Failed ({len(failed)}):")
+        for contact, error in failed:
+            print(f"  {contact['name']} ({contact['phone']}): {error}")
+    print(f"\n✅ Done in {elapsed:.2f}s")
+
+if __name__ == '__main__':
+    main()
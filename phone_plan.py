@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Ethiopian numbering-plan validator and carrier classifier.
+
+normalize_phone() only reformats numbers, so a malformed number comes out as a
+valid-looking +251 entry. This module checks a number against the national
+numbering plan instead: the 9-digit national significant number (NSN) must
+start with a known mobile or landline prefix. Prefixes are stored in a trie
+built once at import, so classifying a number is a walk of a few digits.
+
+Usage:
+    python phone_plan.py accepted_list_decision.csv [--output annotated.csv] [--reject-invalid]
+"""
+
+import argparse
+import csv
+import re
+from collections import namedtuple
+
+from csv_sniff import open_csv
+
+COUNTRY_CODE = '251'
+NSN_LENGTH = 9
+
+# NSN prefix -> (kind, carrier or region)
+NUMBERING_PLAN = {
+    '9': ('mobile', 'Ethio Telecom'),
+    '7': ('mobile', 'Safaricom'),
+    '11': ('landline', 'Addis Ababa'),
+    '22': ('landline', 'South East (Adama)'),
+    '25': ('landline', 'East (Dire Dawa, Harar)'),
+    '33': ('landline', 'North East (Dessie)'),
+    '34': ('landline', 'North (Mekelle)'),
+    '46': ('landline', 'South (Hawassa)'),
+    '47': ('landline', 'South West (Jimma)'),
+    '57': ('landline', 'West (Nekemte)'),
+    '58': ('landline', 'North West (Bahir Dar, Gondar)'),
+}
+
+PhoneInfo = namedtuple('PhoneInfo', 'valid e164 kind carrier reason')
+
+_END = None  # trie key holding the (kind, carrier) of a complete prefix
+
+def build_trie(plan):
+    """Build a digit trie from a prefix -> value mapping."""
+    trie = {}
+    for prefix, value in plan.items():
+        node = trie
+        for digit in prefix:
+            node = node.setdefault(digit, {})
+        node[_END] = value
+    return trie
+
+PLAN_TRIE = build_trie(NUMBERING_PLAN)
+
+def lookup_prefix(nsn, trie=PLAN_TRIE):
+    """Return the value of the longest plan prefix of nsn, or None."""
+    node = trie
+    match = node.get(_END)
+    for digit in nsn:
+        node = node.get(digit)
+        if node is None:
+            break
+        match = node.get(_END, match)
+    return match
+
+def national_number(phone):
+    """Extract the NSN from any of the formats applicants type, or return
+    (None, reason) if the number cannot be Ethiopian."""
+    phone = re.sub(r'[\s\-\(\)\.]', '', str(phone)).strip('"\'')
+    if not phone:
+        return None, 'empty'
+
+    if phone.startswith('+'):
+        if not phone.startswith('+' + COUNTRY_CODE):
+            return None, 'foreign country code'
+        digits = phone[1 + len(COUNTRY_CODE):]
+    elif phone.startswith('00' + COUNTRY_CODE):
+        digits = phone[2 + len(COUNTRY_CODE):]
+    elif phone.startswith(COUNTRY_CODE) and len(phone) > NSN_LENGTH + 1:
+        digits = phone[len(COUNTRY_CODE):]
+    elif phone.startswith('0'):
+        digits = phone[1:]
+    else:
+        digits = phone
+
+    if not digits.isdigit():
+        return None, 'non-digit characters'
+    # A trunk 0 kept after the country code (+2510911...) is a common typo
+    if digits.startswith('0') and len(digits) == NSN_LENGTH + 1:
+        digits = digits[1:]
+    if len(digits) != NSN_LENGTH:
+        return None, f'invalid length ({len(digits)} digits, expected {NSN_LENGTH})'
+    return digits, None
+
+def classify(phone):
+    """Validate a phone number and classify it as mobile (by carrier) or landline."""
+    nsn, reason = national_number(phone)
+    if nsn is None:
+        return PhoneInfo(False, None, None, None, reason)
+
+    match = lookup_prefix(nsn)
+    if match is None:
+        return PhoneInfo(False, None, None, None, f'unknown prefix {nsn[:2]}')
+    kind, carrier = match
+    return PhoneInfo(True, f'+{COUNTRY_CODE}{nsn}', kind, carrier, '')
+
+def classify_all(phones):
+    """Classify many numbers, classifying each distinct number only once."""
+    cache = {}
+    results = []
+    for phone in phones:
+        info = cache.get(phone)
+        if info is None:
+            info = cache[phone] = classify(phone)
+        results.append(info)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('csv_file', nargs='?', default='accepted_list_decision.csv')
+    parser.add_argument('--phone-column', default='applicant_phone')
+    parser.add_argument('--output', help='Write the rows with phone_* annotation columns to this CSV')
+    parser.add_argument('--reject-invalid', action='store_true', help='Leave invalid numbers out of --output')
+    args = parser.parse_args()
+
+    with open_csv(args.csv_file) as reader:
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+
+    infos = classify_all(row.get(args.phone_column, '') for row in rows)
+
+    counts = {}
+    invalid = []
+    for row_num, (row, info) in enumerate(zip(rows, infos), start=2):
+        label = f'{info.kind} ({info.carrier})' if info.valid else 'invalid'
+        counts[label] = counts.get(label, 0) + 1
+        if not info.valid:
+            invalid.append((row_num, row.get('applicant_name', '').strip(), row.get(args.phone_column, ''), info.reason))
+
+    print(f"Checked {len(rows)} numbers from {args.csv_file}")
+    for label, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"  {label}: {count}")
+
+    if invalid:
+        print(f"\n⚠️  Invalid numbers ({len(invalid)}):")
+        for row_num, name, phone, reason in invalid:
+            print(f"  Row {row_num}: {name} - {phone} ({reason})")
+    else:
+        print("\n✓ All numbers are valid")
+
+    if args.output:
+        extra = ['phone_e164', 'phone_kind', 'phone_carrier', 'phone_status']
+        written = 0
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames + extra)
+            writer.writeheader()
+            for row, info in zip(rows, infos):
+                if args.reject_invalid and not info.valid:
+                    continue
+                row.update(phone_e164=info.e164 or '', phone_kind=info.kind or '',
+                           phone_carrier=info.carrier or '', phone_status='ok' if info.valid else info.reason)
+                writer.writerow(row)
+                written += 1
+        print(f"\n✅ Wrote {written} rows to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Script to check the contact scripts for output and performance regressions.
+
+Each case runs one script's main() in a scratch directory on a fixed input
+(the committed CSVs, or a synthetic roster for throughput) and checks:
+
+  - output: every file it writes, and its stdout, must match byte for byte.
+    The committed VCFs (all_contacts.vcf, contacts_group_*.vcf,
+    rejected_only_contact.vcf) are their own golden files; other outputs
+    are checked against the SHA-256 recorded in regression_golden.json.
+  - speed and memory: the best of --repeat runs and the tracemalloc peak are
+    compared with the baseline committed in regression_baseline.json for
+    this machine (platform and Python version), and the gate fails if either
+    grew by more than the threshold. A machine without a baseline fails
+    until one is recorded with --record-baseline (or --no-perf is given).
+
+Baselines change only when --record-baseline is passed on a run whose
+outputs all match, so slow runs never drift the baseline upwards. Every run
+is also appended to regression_history.jsonl (not committed) for trends.
+Exit status is 1 on any failure.
+
+Usage:
+    python regression_gate.py [--repeat 10] [--time-threshold 0.25] [--memory-threshold 0.25]
+    python regression_gate.py --update-golden   # after an intended output change
+    python regression_gate.py --record-baseline # after an intended speed/memory change
+"""
+
+import argparse
+import contextlib
+import difflib
+import gc
+import glob
+import hashlib
+import importlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from contact_table import synthetic_rows
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_FILE = os.path.join(REPO_DIR, 'regression_golden.json')
+BASELINE_FILE = os.path.join(REPO_DIR, 'regression_baseline.json')
+HISTORY_FILE = os.path.join(REPO_DIR, 'regression_history.jsonl')
+SYNTHETIC = '<synthetic>'
+SYNTHETIC_ROWS = 20000
+STDOUT = '<stdout>'
+
+# Differences smaller than these are timer/allocator noise, whatever the ratio
+MIN_TIME_DELTA = 0.005
+MIN_MEMORY_DELTA = 64 * 1024
+
+# case -> (module, argv, {input name in the scratch dir: source file}, committed golden outputs)
+CASES = {
+    'analyze_csv': ('analyze_csv', [], {'accepted_list.csv': 'accepted_list.csv'}, []),
+    'check_duplicates': ('check_duplicates', [], {'accepted_list_decision.csv': 'accepted_list_decision.csv'}, []),
+    'create_complete_vcf': ('create_complete_vcf', [], {'accepted_list_decision.csv': 'accepted_list_decision.csv'},
+                            ['all_contacts.vcf']),
+    'create_rejected_vcf': ('create_rejected_vcf', [], {}, ['rejected_only_contact.vcf']),
+    'create_single_vcf': ('create_single_vcf', [], {'accepted_list.csv': 'accepted_list.csv'}, []),
+    'create_vcf_groups': ('create_vcf_groups', [], {'accepted_list.csv': 'accepted_list.csv'}, ['contacts_group_*.vcf']),
+    'detailed_analysis': ('detailed_analysis', [], {'accepted_list.csv': 'accepted_list.csv'}, []),
+    'check_duplicates_synthetic': ('check_duplicates', [], {'accepted_list_decision.csv': SYNTHETIC}, []),
+    'create_complete_vcf_synthetic': ('create_complete_vcf', [], {'accepted_list_decision.csv': SYNTHETIC}, []),
+    'create_vcf_groups_synthetic': ('create_vcf_groups', ['--group-size', '1000'], {'accepted_list.csv': SYNTHETIC}, []),
+    'detailed_analysis_synthetic': ('detailed_analysis', [], {'accepted_list.csv': SYNTHETIC}, []),
+}
+
+def write_synthetic(path, rows=SYNTHETIC_ROWS):
+    """Write a deterministic roster in the accepted_list.csv layout."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('applicant_name,applicant_phone\n')
+        f.writelines(f'"{name}",{phone}\n' for _, name, phone in synthetic_rows(rows))
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def count_rows(path):
+    with open(path, 'rb') as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+def calibrate(repeat=3):
+    """Best time of a fixed pure-Python workload, to factor out machine speed."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table = {}
+        for i in range(200000):
+            key = f'09{(i * 7919) % 100000000:08d}'
+            table[key] = table.get(key, 0) + 1
+        sorted(table)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_once(module, argv, work_dir, trace=False):
+    """Run module.main() in work_dir; return (seconds, peak bytes, stdout bytes)."""
+    output = io.StringIO()
+    old_argv, old_cwd = sys.argv, os.getcwd()
+    sys.argv = [module.__name__] + argv
+    os.chdir(work_dir)
+    try:
+        if trace:
+            tracemalloc.start()
+        # Collector pauses land at random points; keep them out of the timing
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            module.main()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    finally:
+        gc.enable()
+        if trace:
+            tracemalloc.stop()
+        sys.argv = old_argv
+        os.chdir(old_cwd)
+    return elapsed, peak, output.getvalue().encode('utf-8')
+
+def run_case(name, scratch, synthetic_path, repeat):
+    """Run one case; return (measurements, {output name: path of produced bytes})."""
+    module_name, argv, inputs, _ = CASES[name]
+    module = importlib.import_module(module_name)
+    work_dir = os.path.join(scratch, name)
+
+    def fresh_dir():
+        shutil.rmtree(work_dir, ignore_errors=True)
+        os.makedirs(work_dir)
+        for target, source in inputs.items():
+            shutil.copyfile(synthetic_path if source == SYNTHETIC else os.path.join(REPO_DIR, source),
+                            os.path.join(work_dir, target))
+
+    times = []
+    calibration = calibrate()
+    for _ in range(repeat):
+        fresh_dir()
+        elapsed, _, stdout = run_once(module, argv, work_dir)
+        times.append(elapsed)
+    calibration = min(calibration, calibrate())
+    fresh_dir()
+    _, peak, stdout = run_once(module, argv, work_dir, trace=True)
+
+    with open(os.path.join(work_dir, STDOUT), 'wb') as f:
+        f.write(stdout)
+    outputs = {entry: os.path.join(work_dir, entry) for entry in sorted(os.listdir(work_dir))
+               if entry not in inputs}
+
+    rows = sum(count_rows(os.path.join(work_dir, target)) for target in inputs)
+    if not rows:
+        # No CSV input: count the records produced instead
+        rows = sum(open(path, 'rb').read().count(b'BEGIN:VCARD') for path in outputs.values())
+    best = min(times)
+    return {'seconds': round(best, 6), 'calibration': round(calibration, 6), 'rows': rows, 'rows_per_sec': round(rows / best, 1) if best else None,
+            'peak_bytes': peak}, outputs
+
+def check_outputs(name, outputs, golden):
+    """Compare produced outputs with golden files; return a list of failure messages."""
+    failures = []
+    committed = []
+    for pattern in CASES[name][3]:
+        committed.extend(os.path.basename(p) for p in glob.glob(os.path.join(REPO_DIR, pattern)))
+
+    for entry in sorted(set(committed) - set(outputs)):
+        failures.append(f'{entry} was not produced')
+    for entry, path in outputs.items():
+        if entry in committed:
+            with open(path, 'rb') as f:
+                actual = f.read()
+            with open(os.path.join(REPO_DIR, entry), 'rb') as f:
+                expected = f.read()
+            if actual != expected:
+                diff = difflib.unified_diff(expected.decode('utf-8', 'replace').splitlines(),
+                                            actual.decode('utf-8', 'replace').splitlines(),
+                                            f'golden/{entry}', f'actual/{entry}', lineterm='', n=1)
+                failures.append(f'{entry} differs from the committed file:\n      '
+                                + '\n      '.join(list(diff)[:20]))
+        else:
+            expected = golden.get(name, {}).get(entry)
+            if expected is None:
+                failures.append(f'{entry} has no golden hash (run with --update-golden)')
+            elif sha256_file(path) != expected:
+                failures.append(f'{entry} differs from its golden hash')
+    for entry in sorted(set(golden.get(name, {})) - set(outputs)):
+        failures.append(f'{entry} was not produced')
+    return failures
+
+def machine_key():
+    """Baselines are only comparable on the same platform and Python version."""
+    return f'{platform.system()}-{platform.machine()}-py{platform.python_version_tuple()[0]}.{platform.python_version_tuple()[1]}'
+
+def load_baselines(path):
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def check_performance(result, base, time_threshold, memory_threshold):
+    failures = []
+    if base is None:
+        return ['no baseline for this case on this machine (run with --record-baseline)']
+    base_seconds, base_peak = base['seconds'], base['peak_bytes']
+    # Scale the baseline by how fast this machine runs the calibration workload right now
+    base_seconds *= result['calibration'] / base['calibration']
+    if (result['seconds'] > base_seconds * (1 + time_threshold)
+            and result['seconds'] - base_seconds > MIN_TIME_DELTA):
+        failures.append(f"slower: {result['seconds'] * 1000:.1f} ms vs baseline {base_seconds * 1000:.1f} ms")
+    if (result['peak_bytes'] > base_peak * (1 + memory_threshold)
+            and result['peak_bytes'] - base_peak > MIN_MEMORY_DELTA):
+        failures.append(f"more memory: peak {result['peak_bytes'] / 1024:.0f} KiB "
+                        f"vs baseline {base_peak / 1024:.0f} KiB")
+    return failures
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('cases', nargs='*', help=f"Cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument('--repeat', type=int, default=10, help='Timed runs per case; the best one counts')
+    parser.add_argument('--time-threshold', type=float, default=0.25, help='Allowed slowdown (0.25 = 25%%)')
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help='Allowed peak memory growth')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--machine', default=machine_key(), help='Baseline key (default: %(default)s)')
+    parser.add_argument('--record-baseline', action='store_true',
+                        help='Store this run as the baseline for --machine if all outputs match')
+    parser.add_argument('--no-perf', action='store_true', help='Only check outputs')
+    parser.add_argument('--history', default=HISTORY_FILE)
+    parser.add_argument('--no-record', action='store_true', help='Do not append this run to the history')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='Accept the current outputs as golden (committed VCFs are not touched)')
+    args = parser.parse_args()
+
+    names = args.cases or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    golden = {}
+    if os.path.exists(GOLDEN_FILE):
+        with open(GOLDEN_FILE, encoding='utf-8') as f:
+            golden = json.load(f)
+    baselines = load_baselines(args.baseline)
+    machine_baseline = baselines.get(args.machine, {}).get('cases', {})
+    check_perf = not args.no_perf and not args.record_baseline
+    if check_perf and not machine_baseline:
+        print(f"⚠️  No performance baseline for {args.machine} in {os.path.basename(args.baseline)}: "
+              "record one with --record-baseline, or pass --no-perf to check outputs only")
+    sys.path.insert(0, REPO_DIR)
+
+    results = {}
+    failed = 0
+    with tempfile.TemporaryDirectory(prefix='regression_') as scratch:
+        synthetic_path = os.path.join(scratch, 'synthetic.csv')
+        write_synthetic(synthetic_path)
+
+        print("=" * 80)
+        print("REGRESSION GATE:")
+        print("=" * 80)
+        for name in names:
+            result, outputs = run_case(name, scratch, synthetic_path, args.repeat)
+            results[name] = result
+
+            if args.update_golden:
+                committed = {os.path.basename(p) for pattern in CASES[name][3]
+                             for p in glob.glob(os.path.join(REPO_DIR, pattern))}
+                golden[name] = {entry: sha256_file(path) for entry, path in outputs.items()
+                                if entry not in committed}
+
+            failures = check_outputs(name, outputs, golden)
+            if check_perf:
+                failures += check_performance(result, machine_baseline.get(name),
+                                              args.time_threshold, args.memory_threshold)
+            status = '✅' if not failures else '❌'
+            print(f"{status} {name:32s} {result['seconds'] * 1000:8.1f} ms  "
+                  f"{result['rows_per_sec'] or 0:10.0f} rows/s  peak {result['peak_bytes'] / 1024:8.0f} KiB")
+            for failure in failures:
+                print(f"      {failure}")
+            if failures:
+                failed += 1
+                # Keep the outputs of a failing case for inspection
+                kept = os.path.join(tempfile.gettempdir(), f'regression_failed_{name}')
+                shutil.rmtree(kept, ignore_errors=True)
+                shutil.copytree(os.path.join(scratch, name), kept)
+                print(f"      outputs kept in {kept}")
+
+    if args.update_golden:
+        with open(GOLDEN_FILE, 'w', encoding='utf-8') as f:
+            json.dump(golden, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nUpdated {os.path.basename(GOLDEN_FILE)}")
+
+    if args.record_baseline:
+        if failed:
+            print("\n⚠️  Baseline not recorded: fix the output failures first")
+        else:
+            cases = dict(machine_baseline, **results)
+            baselines[args.machine] = {'recorded_at': datetime.now().isoformat(timespec='seconds'),
+                                       'revision': git_revision(), 'cases': cases}
+            with open(args.baseline, 'w', encoding='utf-8') as f:
+                json.dump(baselines, f, indent=2, sort_keys=True)
+                f.write('\n')
+            print(f"\nRecorded the {args.machine} baseline in {os.path.basename(args.baseline)}")
+
+    if not args.no_record:
+        entry = {
+            'machine': args.machine,
+            'at': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'passed': not failed,
+            'cases': results,
+        }
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    if failed:
+        print(f"\n⚠️  {failed} of {len(names)} cases failed")
+        sys.exit(1)
+    print(f"\n✅ All {len(names)} cases match their golden outputs and baselines")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Streaming report writer for the analysis scripts.
+
+Findings are written as they are produced to findings.jsonl and to numbered
+static HTML pages of a fixed size, so a run with tens of thousands of findings
+never holds them all in memory or prints them all to the terminal. Only the
+counts per issue type and the most frequent keys are kept; on close they
+become index.html, a summary with the top offenders and links to every page,
+and summary.json.
+
+Offender counts are bounded: once an issue tracks more than
+2 * MAX_TRACKED_KEYS distinct keys, only the MAX_TRACKED_KEYS most frequent
+are kept, so keys that repeat (names, phones) stay at the top while
+one-off keys are dropped. Findings added without a key (e.g. a missing
+field on one row) are counted by issue only.
+"""
+
+import html
+import json
+import os
+from collections import Counter
+
+PAGE_SIZE = 500
+TOP_OFFENDERS = 20
+MAX_TRACKED_KEYS = 1000
+
+PAGE_STYLE = """<style>
+body { font-family: system-ui, sans-serif; margin: 2rem; color: #1f2d3d; }
+table { border-collapse: collapse; width: 100%; margin-bottom: 1.5rem; }
+th, td { border: 1px solid #e5e7eb; padding: 4px 8px; text-align: left; vertical-align: top; }
+th { background: #f9fafb; }
+.nav a { margin-right: 1rem; }
+</style>"""
+
+def _cell(value):
+    if isinstance(value, (list, tuple)):
+        value = ', '.join(str(v) for v in value)
+    return html.escape(str(value))
+
+class ReportWriter:
+    """Write findings to JSON Lines plus paginated HTML under `out_dir`."""
+
+    def __init__(self, out_dir, title, page_size=PAGE_SIZE):
+        self.out_dir = out_dir
+        self.title = title
+        self.page_size = page_size
+        self.counts = Counter()
+        self.offenders = {}
+        self.total = 0
+        self.pages = 0
+        self._page = None
+        self._page_rows = 0
+
+        os.makedirs(out_dir, exist_ok=True)
+        self._jsonl = open(os.path.join(out_dir, 'findings.jsonl'), 'w', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _page_name(self, number):
+        return f'page_{number:04d}.html'
+
+    def _open_page(self):
+        self.pages += 1
+        self._page = open(os.path.join(self.out_dir, self._page_name(self.pages)), 'w', encoding='utf-8')
+        self._page.write(f'<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+                         f'<title>{html.escape(self.title)} - page {self.pages}</title>{PAGE_STYLE}</head><body>\n'
+                         f'<p class="nav"><a href="index.html">Summary</a>'
+                         + (f'<a href="{self._page_name(self.pages - 1)}">&larr; Previous</a>' if self.pages > 1 else '')
+                         + f'</p>\n<h1>{html.escape(self.title)}: page {self.pages}</h1>\n'
+                         '<table><tr><th>#</th><th>Issue</th><th>Key</th><th>Details</th></tr>\n')
+        self._page_rows = 0
+
+    def _close_page(self, has_next):
+        if self._page is None:
+            return
+        self._page.write('</table>\n<p class="nav"><a href="index.html">Summary</a>'
+                         + (f'<a href="{self._page_name(self.pages + 1)}">Next &rarr;</a>' if has_next else '')
+                         + '</p>\n</body></html>\n')
+        self._page.close()
+        self._page = None
+
+    def add(self, issue, key=None, **details):
+        """Record one finding of type `issue` about `key` (a name, phone...), if any."""
+        self.total += 1
+        self.counts[issue] += 1
+        if key is not None:
+            offenders = self.offenders.setdefault(issue, Counter())
+            offenders[str(key)] += 1
+            if len(offenders) > 2 * MAX_TRACKED_KEYS:
+                self.offenders[issue] = Counter(dict(offenders.most_common(MAX_TRACKED_KEYS)))
+
+        record = {'issue': issue, **({'key': key} if key is not None else {}), **details}
+        self._jsonl.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        if self._page is not None and self._page_rows >= self.page_size:
+            self._close_page(has_next=True)
+        if self._page is None:
+            self._open_page()
+        detail_text = '<br>'.join(f'<b>{html.escape(k)}</b>: {_cell(v)}' for k, v in details.items())
+        self._page.write(f'<tr><td>{self.total}</td><td>{html.escape(issue)}</td>'
+                         f'<td>{_cell("" if key is None else key)}</td><td>{detail_text}</td></tr>\n')
+        self._page_rows += 1
+
+    def summary(self):
+        """Counts per issue type and the keys with the most findings."""
+        return {
+            'title': self.title,
+            'total': self.total,
+            'pages': self.pages,
+            'counts': dict(self.counts.most_common()),
+            'top_offenders': {issue: offenders.most_common(TOP_OFFENDERS)
+                              for issue, offenders in self.offenders.items()},
+        }
+
+    def close(self, extra=None):
+        """Finish the last page and write the summary index."""
+        if self._jsonl.closed:
+            return
+        self._close_page(has_next=False)
+        self._jsonl.close()
+
+        summary = self.summary()
+        if extra:
+            summary['extra'] = extra
+        with open(os.path.join(self.out_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        with open(os.path.join(self.out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(f'<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+                    f'<title>{html.escape(self.title)}</title>{PAGE_STYLE}</head><body>\n'
+                    f'<h1>{html.escape(self.title)}</h1>\n<p>{self.total} findings on {self.pages} pages '
+                    f'(<a href="findings.jsonl">findings.jsonl</a>)</p>\n')
+            if extra:
+                f.write('<table>' + ''.join(f'<tr><th>{html.escape(str(k))}</th><td>{_cell(v)}</td></tr>'
+                                            for k, v in extra.items()) + '</table>\n')
+            f.write('<h2>Findings by type</h2>\n<table><tr><th>Issue</th><th>Count</th></tr>\n')
+            for issue, count in self.counts.most_common():
+                f.write(f'<tr><td>{html.escape(issue)}</td><td>{count}</td></tr>\n')
+            f.write('</table>\n')
+            for issue, offenders in summary['top_offenders'].items():
+                f.write(f'<h2>Top {html.escape(issue)}</h2>\n<table><tr><th>Key</th><th>Findings</th></tr>\n')
+                for key, count in offenders:
+                    f.write(f'<tr><td>{html.escape(key)}</td><td>{count}</td></tr>\n')
+                f.write('</table>\n')
+            f.write('<h2>Pages</h2>\n<p class="nav">'
+                    + ''.join(f'<a href="{self._page_name(n)}">{n}</a>' for n in range(1, self.pages + 1))
+                    + '</p>\n</body></html>\n')
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Script to aggregate judge evaluations into a ranking and a decision list.
+
+Reads exported evaluation records (appointment_id, judge_name, criteria_name,
+rating, comments) from CSV, JSON Lines, or the JSON returned by
+/schedule/appointments/<id>/evaluations. A strict judge's 3 can mean as much
+as a generous judge's 4, so every rating is first converted to a z-score
+against that judge's own mean and spread. An applicant's score is the
+mean z-score per criterion, averaged over the criteria.
+
+0 is a score a judge can pick, so zero ratings are scored. But the judge page
+also submits 0 for every criterion a judge never touched, so a submission
+that is all zeros (one judge, one appointment) is read as "not rated" and
+left out, unless --keep-zero is given.
+
+Applicants are ranked by score. Those inside the cut-off (--accept-top,
+--accept-fraction or --min-score) and seen by at least --min-judges judges
+are written to a CSV with the same columns as accepted_list_decision.csv.
+The full ranking goes to --ranking.
+
+Ratings are held as parallel columns (appointment, judge and criterion codes
+plus the rating), and every aggregate is one pass of running sums over them.
+
+Usage:
+    python score_evaluations.py evaluations.csv [--appointments 'appointments_*.csv'] [--accept-top 150]
+"""
+
+import argparse
+import csv
+import glob
+import json
+import math
+import time
+from array import array
+
+from contact_store import clean_name
+from csv_sniff import open_csv, open_text
+from season_batch import parse_export, sort_exports
+
+class Ratings:
+    """Columnar ratings: one row per (appointment, judge, criterion)."""
+
+    def __init__(self):
+        self.appointments = []
+        self.judges = []
+        self.criteria = []
+        self._codes = ({}, {}, {})
+        self.app_codes = array('I')
+        self.judge_codes = array('H')
+        self.criteria_codes = array('H')
+        self.values = array('d')
+        self._rows = {}
+        self.applicants = {}  # appointment id -> (name, phone) when the export has them
+
+    def _code(self, which, labels, value):
+        codes = self._codes[which]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(labels)
+            labels.append(value)
+        return code
+
+    def add(self, appointment_id, judge, criterion, rating):
+        """Add one rating; a later rating for the same cell replaces the earlier one."""
+        key = (self._code(0, self.appointments, appointment_id),
+               self._code(1, self.judges, judge),
+               self._code(2, self.criteria, criterion))
+        row = self._rows.get(key)
+        if row is not None:
+            self.values[row] = rating
+            return
+        self._rows[key] = len(self.values)
+        self.app_codes.append(key[0])
+        self.judge_codes.append(key[1])
+        self.criteria_codes.append(key[2])
+        self.values.append(rating)
+
+    def __len__(self):
+        return len(self.values)
+
+def iter_records(path):
+    """Yield evaluation records from a CSV, JSON Lines or JSON export."""
+    if path.endswith('.csv'):
+        with open_csv(path) as reader:
+            yield from reader
+        return
+    with open_text(path) as f:
+        text = f.read()
+    if path.endswith('.jsonl'):
+        for line in text.splitlines():
+            if line.strip():
+                yield json.loads(line)
+        return
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get('evaluations', [])
+    yield from data
+
+def load_ratings(paths, skip_empty=True):
+    """Read every export into one Ratings table; return (ratings, skipped, empty).
+
+    empty counts the all-zero submissions (one judge, one appointment); they
+    are left out when skip_empty is set.
+    """
+    ratings = Ratings()
+    cells = {}  # (appointment, judge, criterion) -> rating; a later record replaces an earlier one
+    skipped = 0
+    for path in paths:
+        for record in iter_records(path):
+            appointment_id = str(record.get('appointment_id', '')).strip()
+            judge = str(record.get('judge_name', '')).strip()
+            criterion = str(record.get('criteria_name', '')).strip()
+            try:
+                rating = float(record.get('rating'))
+            except (TypeError, ValueError):
+                rating = math.nan
+            if not appointment_id or not judge or not criterion or math.isnan(rating):
+                skipped += 1
+                continue
+            cells[appointment_id, judge, criterion] = rating
+            if record.get('applicant_phone'):
+                ratings.applicants[appointment_id] = (clean_name(record.get('applicant_name')),
+                                                      str(record['applicant_phone']).strip())
+
+    # The judge page posts 0 for every criterion left untouched, so only a
+    # submission with no nonzero rating at all is an unrated form
+    rated = {(appointment_id, judge) for (appointment_id, judge, _), rating in cells.items() if rating}
+    empty = {(appointment_id, judge) for appointment_id, judge, _ in cells} - rated
+    for (appointment_id, judge, criterion), rating in cells.items():
+        if skip_empty and (appointment_id, judge) in empty:
+            continue
+        ratings.add(appointment_id, judge, criterion, rating)
+    return ratings, skipped, len(empty)
+
+def judge_stats(ratings):
+    """Return per-judge (count, mean, std) lists, indexed by judge code."""
+    n = [0] * len(ratings.judges)
+    total = [0.0] * len(ratings.judges)
+    total_sq = [0.0] * len(ratings.judges)
+    for judge, value in zip(ratings.judge_codes, ratings.values):
+        n[judge] += 1
+        total[judge] += value
+        total_sq[judge] += value * value
+    means = [t / c if c else 0.0 for t, c in zip(total, n)]
+    stds = [math.sqrt(max(sq / c - m * m, 0.0)) if c else 0.0 for sq, c, m in zip(total_sq, n, means)]
+    return n, means, stds
+
+def zscores(ratings, means, stds):
+    """Z-score every rating against its judge; a judge who gave one value throughout scores 0."""
+    return array('d', ((value - means[judge]) / stds[judge] if stds[judge] else 0.0
+                       for judge, value in zip(ratings.judge_codes, ratings.values)))
+
+def applicant_scores(ratings, z):
+    """Return one dict per appointment with its score, raw mean and judge count."""
+    num_criteria = len(ratings.criteria)
+    cell_sum = {}
+    cell_n = {}
+    raw_sum = [0.0] * len(ratings.appointments)
+    raw_n = [0] * len(ratings.appointments)
+    judges = [set() for _ in ratings.appointments]
+    for app, judge, criterion, value, score in zip(ratings.app_codes, ratings.judge_codes,
+                                                   ratings.criteria_codes, ratings.values, z):
+        cell = app * num_criteria + criterion
+        cell_sum[cell] = cell_sum.get(cell, 0.0) + score
+        cell_n[cell] = cell_n.get(cell, 0) + 1
+        raw_sum[app] += value
+        raw_n[app] += 1
+        judges[app].add(judge)
+
+    # Mean over judges within a criterion, then over criteria, so a criterion
+    # rated by more judges does not weigh more
+    criteria_sum = [0.0] * len(ratings.appointments)
+    criteria_n = [0] * len(ratings.appointments)
+    for cell, total in cell_sum.items():
+        app = cell // num_criteria
+        criteria_sum[app] += total / cell_n[cell]
+        criteria_n[app] += 1
+
+    return [{
+        'appointment_id': appointment_id,
+        'score': criteria_sum[app] / criteria_n[app],
+        'raw_mean': raw_sum[app] / raw_n[app],
+        'judges': len(judges[app]),
+        'criteria': criteria_n[app],
+    } for app, appointment_id in enumerate(ratings.appointments)]
+
+def decide(ranked, accept_top=None, accept_fraction=None, min_score=None, min_judges=1):
+    """Mark each ranked applicant accepted, rejected or pending (too few judges)."""
+    eligible = [item for item in ranked if item['judges'] >= min_judges]
+    limit = len(eligible)
+    if accept_top is not None:
+        limit = min(limit, accept_top)
+    if accept_fraction is not None:
+        limit = min(limit, math.floor(len(eligible) * accept_fraction + 1e-9))
+    accepted = 0
+    for item in ranked:
+        if item['judges'] < min_judges:
+            item['decision'] = 'pending'
+        elif accepted < limit and (min_score is None or item['score'] >= min_score):
+            item['decision'] = 'accepted'
+            accepted += 1
+        else:
+            item['decision'] = 'rejected'
+    return ranked
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('evaluations', nargs='+', help='Evaluation exports (.csv, .jsonl or .json)')
+    parser.add_argument('--appointments', default='appointments_*.csv',
+                        help='Appointment exports giving the name and phone of each appointment id')
+    parser.add_argument('--accept-top', type=int, help='Accept at most this many applicants')
+    parser.add_argument('--accept-fraction', type=float, help='Accept at most this fraction of eligible applicants')
+    parser.add_argument('--min-score', type=float, help='Accept only applicants with at least this z-score')
+    parser.add_argument('--min-judges', type=int, default=2, help='Fewer judges than this leaves an applicant pending')
+    parser.add_argument('--keep-zero', action='store_true',
+                        help='Also score submissions where every rating is 0 (by default they count as not rated)')
+    parser.add_argument('--output', default='accepted_list_scored.csv')
+    parser.add_argument('--ranking', default='evaluation_ranking.csv')
+    args = parser.parse_args()
+
+    if args.accept_top is None and args.accept_fraction is None and args.min_score is None:
+        parser.error('give a cut-off: --accept-top, --accept-fraction and/or --min-score')
+
+    start = time.perf_counter()
+    ratings, skipped, empty = load_ratings(args.evaluations, skip_empty=not args.keep_zero)
+    if not len(ratings):
+        print("No evaluation records found")
+        return
+
+    applicants = {}
+    # Oldest export first, so the latest export's name and phone win
+    for path in sort_exports(p for p in glob.glob(args.appointments) if not p.endswith('_season.csv')):
+        for row in parse_export(path)[1]:
+            applicants[row['id']] = (row['applicant_name'], row['applicant_phone'])
+    applicants.update(ratings.applicants)
+
+    counts, means, stds = judge_stats(ratings)
+    z = zscores(ratings, means, stds)
+    ranked = sorted(applicant_scores(ratings, z), key=lambda item: (-item['score'], -item['raw_mean']))
+    decide(ranked, args.accept_top, args.accept_fraction, args.min_score, args.min_judges)
+    elapsed = time.perf_counter() - start
+
+    missing = 0
+    with open(args.ranking, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['rank', 'appointment_id', 'applicant_name', 'applicant_phone', 'score', 'raw_mean',
+                         'judges', 'criteria', 'decision'])
+        for rank, item in enumerate(ranked, start=1):
+            name, phone = applicants.get(item['appointment_id'], ('', ''))
+            writer.writerow([rank, item['appointment_id'], name, phone, f"{item['score']:.4f}",
+                             f"{item['raw_mean']:.2f}", item['judges'], item['criteria'], item['decision']])
+
+    with open(args.output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['applicant_name', 'applicant_phone'])
+        for item in ranked:
+            if item['decision'] != 'accepted':
+                continue
+            name, phone = applicants.get(item['appointment_id'], ('', ''))
+            if not phone:
+                missing += 1
+                continue
+            writer.writerow([name, phone])
+
+    print("=" * 80)
+    print("JUDGES:")
+    print("=" * 80)
+    for code, judge in enumerate(ratings.judges):
+        print(f"{judge:20s} {counts[code]:6d} ratings, mean {means[code]:.2f}, std {stds[code]:.2f}")
+
+    decisions = {}
+    for item in ranked:
+        decisions[item['decision']] = decisions.get(item['decision'], 0) + 1
+    print(f"\nScored {len(ranked)} applicants from {len(ratings)} ratings in {elapsed * 1000:.0f} ms"
+          + (f" ({skipped} records skipped)" if skipped else ''))
+    for decision in ('accepted', 'rejected', 'pending'):
+        print(f"  {decision}: {decisions.get(decision, 0)}")
+    if empty and args.keep_zero:
+        print(f"\n⚠️  Scored {empty} all-zero submissions; the judge page submits 0 for untouched criteria")
+    elif empty:
+        print(f"\nIgnored {empty} all-zero submissions as not rated (pass --keep-zero to score them)")
+    if missing:
+        print(f"\n⚠️  {missing} accepted appointments have no name/phone; pass their appointment exports")
+    print(f"\n✅ Created {args.output} and {args.ranking}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Script to process every dated appointment export of the season at once.
+
+Each appointments_<date>.csv is parsed and normalized in its own worker
+process, so the whole season takes about as long as the slowest file. The
+results are merged into one time-ordered season table: the same appointment
+exported twice is kept once, and an applicant booked into several slots on
+the same day keeps only the earliest one. Per-day statistics are printed.
+
+When an appointment appears in several exports, the copy from the latest
+export wins. Exports are ordered by the date in their file name
+(appointments_nov28_2025.csv, appointments_2025-11-28.csv, ...), or by
+modification time when the name has no date, never by how the names sort.
+Applicants are matched on their national number, so +2510943... and
+0943... are the same person.
+
+Usage:
+    python season_batch.py ['appointments_*.csv'] [--output appointments_season.csv]
+"""
+
+import argparse
+import csv
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from contact_store import clean_name, normalize_phone
+from contact_table import int_to_phone, phone_to_int
+from csv_sniff import open_csv
+
+SEASON_FIELDS = ['id', 'applicant_name', 'applicant_phone', 'normalized_phone', 'scheduled_date',
+                 'scheduled_time', 'scheduled_at', 'selected_song', 'additional_song',
+                 'additional_song_singer', 'source_file']
+
+EXPORT_NAME = re.compile(r'appointments_(.+)\.csv$', re.IGNORECASE)
+EXPORT_DATE_FORMATS = ('%b%d_%Y', '%B%d_%Y', '%Y-%m-%d', '%Y%m%d', '%d%b%Y', '%b%d%Y')
+
+def export_date(path):
+    """Date of an export: parsed from appointments_<date>.csv, else its modification time."""
+    match = EXPORT_NAME.search(os.path.basename(path))
+    if match:
+        for fmt in EXPORT_DATE_FORMATS:
+            try:
+                return datetime.strptime(match.group(1), fmt)
+            except ValueError:
+                continue
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+def sort_exports(paths):
+    """Order export files oldest first, so later exports override earlier ones."""
+    return sorted(paths, key=lambda path: (export_date(path), path))
+
+def season_phone(phone):
+    """Canonical +251XXXXXXXXX form of a phone, or the normalized text if it is invalid."""
+    return int_to_phone(phone_to_int(phone)) or normalize_phone(phone)
+
+def parse_slot(date, slot_time):
+    """Parse '2025-11-18' + '10:07 AM' into a datetime, or None."""
+    for fmt in ('%Y-%m-%d %I:%M %p', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(f'{date} {slot_time}'.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+def parse_export(path):
+    """Parse and normalize one appointments export (runs in a worker process)."""
+    rows = []
+    skipped = 0
+    with open_csv(path) as reader:
+        for row in reader:
+            phone = row.get('applicant_phone', '').strip()
+            date = row.get('scheduled_date', '').strip()
+            slot_time = row.get('scheduled_time', '').strip()
+            scheduled_at = parse_slot(date, slot_time)
+            if not phone or scheduled_at is None:
+                skipped += 1
+                continue
+            rows.append({
+                'id': row.get('id', '').strip(),
+                'applicant_name': clean_name(row.get('applicant_name')),
+                'applicant_phone': phone,
+                'normalized_phone': season_phone(phone),
+                'scheduled_date': date,
+                'scheduled_time': slot_time,
+                'scheduled_at': scheduled_at.isoformat(timespec='minutes'),
+                'selected_song': (row.get('selected_song') or '').strip(),
+                'additional_song': (row.get('additional_song') or '').strip(),
+                'additional_song_singer': (row.get('additional_song_singer') or '').strip(),
+                'source_file': os.path.basename(path),
+            })
+    return path, rows, skipped
+
+def season_order(row):
+    """Sort key: time, then id, comparing numeric ids as numbers (9 before 10)."""
+    appointment_id = row['id']
+    if appointment_id.isdigit():
+        return row['scheduled_at'], 0, int(appointment_id), ''
+    return row['scheduled_at'], 1, 0, appointment_id
+
+def merge_season(results):
+    """Merge per-file rows into one deduplicated, time-ordered table.
+
+    An appointment exported more than once keeps its copy from the latest
+    export (see sort_exports), whatever order results come in.
+    Returns (rows, duplicate_ids, duplicate_bookings).
+    """
+    by_path = {path: (rows, skipped) for path, rows, skipped in results}
+    by_id = {}
+    duplicate_ids = 0
+    for path in sort_exports(by_path):
+        rows, _ = by_path[path]
+        for row in rows:
+            # Without an id, fall back to who/when as the appointment identity
+            key = row['id'] or (row['normalized_phone'], row['scheduled_at'])
+            if key in by_id:
+                duplicate_ids += 1
+            by_id[key] = row
+
+    season = []
+    seen_days = set()
+    duplicate_bookings = 0
+    for row in sorted(by_id.values(), key=season_order):
+        day_key = (row['normalized_phone'], row['scheduled_date'])
+        if day_key in seen_days:
+            duplicate_bookings += 1
+            continue
+        seen_days.add(day_key)
+        season.append(row)
+    return season, duplicate_ids, duplicate_bookings
+
+def day_stats(season):
+    """Return {date: {count, first, last, avg_gap_min}} for the merged table."""
+    days = {}
+    for row in season:
+        days.setdefault(row['scheduled_date'], []).append(datetime.fromisoformat(row['scheduled_at']))
+
+    stats = {}
+    for date, slots in sorted(days.items()):
+        gaps = [(b - a).total_seconds() / 60 for a, b in zip(slots, slots[1:])]
+        stats[date] = {
+            'count': len(slots),
+            'first': slots[0].strftime('%I:%M %p'),
+            'last': slots[-1].strftime('%I:%M %p'),
+            'avg_gap_min': sum(gaps) / len(gaps) if gaps else 0.0,
+        }
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pattern', nargs='?', default='appointments_*.csv')
+    parser.add_argument('--output', default='appointments_season.csv')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    files = sort_exports(p for p in glob.glob(args.pattern) if os.path.abspath(p) != os.path.abspath(args.output))
+    if not files:
+        print(f"No files match {args.pattern}")
+        return
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(parse_export, files))
+
+    for path, rows, skipped in results:
+        note = f" ({skipped} rows skipped: missing phone or unparseable slot)" if skipped else ''
+        print(f"Parsed {path}: {len(rows)} appointments{note}")
+
+    season, duplicate_ids, duplicate_bookings = merge_season(results)
+
+    with open(args.output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SEASON_FIELDS)
+        writer.writeheader()
+        writer.writerows(season)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 80)
+    print("PER-DAY STATISTICS:")
+    print("=" * 80)
+    for date, s in day_stats(season).items():
+        print(f"{date}: {s['count']:4d} appointments, {s['first']} - {s['last']}, "
+              f"avg gap {s['avg_gap_min']:.1f} min")
+
+    print(f"\nDuplicate exports of the same appointment: {duplicate_ids}")
+    print(f"Extra same-day bookings dropped: {duplicate_bookings}")
+    print(f"Unique applicants: {len(set(r['normalized_phone'] for r in season))}")
+    print(f"\n✅ Created {args.output} with {len(season)} appointments from {len(files)} files in {elapsed:.2f}s")
+
+if __name__ == '__main__':
+    main()
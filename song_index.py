@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Script to build a song and singer index from the season's appointment exports.
+
+Applicants type song titles and singers freely, so one song shows up as
+"ስምህን አወኩት" and "ሥምህን አውቅኩት ተረዳሁት", and one singer as "Aster abebe ",
+"Aster abebe" and "አስቴር አበበ". Names are normalized (Ethiopic homophone
+letters folded, punctuation and spacing removed), transliterated to Latin so
+both scripts compare, and then grouped with a fuzzy match. The index stores
+counts per day and per hour slot, so musicians can plan accompaniment from
+song_index.json without rescanning the CSVs.
+
+Usage:
+    python song_index.py ['appointments_*.csv'] [--output song_index.json] [--top 15]
+"""
+
+import argparse
+import glob
+import json
+import re
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from difflib import SequenceMatcher
+
+from season_batch import merge_season, parse_export
+
+# Ethiopic letters that are pronounced the same: fold each series onto one
+HOMOPHONE_SERIES = {
+    0x1210: 0x1200,  # ሐ -> ሀ
+    0x1280: 0x1200,  # ኀ -> ሀ
+    0x1220: 0x1230,  # ሠ -> ሰ
+    0x12D0: 0x12A0,  # ዐ -> አ
+    0x1340: 0x1338,  # ፀ -> ጸ
+}
+HOMOPHONE_MAP = {base + order: target + order
+                 for base, target in HOMOPHONE_SERIES.items() for order in range(8)}
+# Fourth-order ha/a are written interchangeably with the first order
+HOMOPHONE_MAP.update({0x1203: 0x1200, 0x12A3: 0x12A0})
+
+# Latin consonant of each Ethiopic row (8 code points per row from U+1200)
+ETHIOPIC_CONSONANTS = {
+    0x1200: 'h', 0x1208: 'l', 0x1210: 'h', 0x1218: 'm', 0x1220: 's', 0x1228: 'r',
+    0x1230: 's', 0x1238: 'sh', 0x1240: 'q', 0x1260: 'b', 0x1268: 'v', 0x1270: 't',
+    0x1278: 'ch', 0x1280: 'h', 0x1290: 'n', 0x1298: 'ny', 0x12A0: '', 0x12A8: 'k',
+    0x12B8: 'h', 0x12C8: 'w', 0x12D0: '', 0x12D8: 'z', 0x12E0: 'zh', 0x12E8: 'y',
+    0x12F0: 'd', 0x1300: 'j', 0x1308: 'g', 0x1320: 't', 0x1328: 'ch', 0x1330: 'p',
+    0x1338: 'ts', 0x1340: 'ts', 0x1348: 'f', 0x1350: 'p',
+}
+# Vowel of each order; the sixth order is usually a bare consonant
+ETHIOPIC_VOWELS = ['e', 'u', 'i', 'a', 'e', '', 'o', 'wa']
+
+def fold_ethiopic(text):
+    """Fold Ethiopic homophone letters onto one canonical series."""
+    return text.translate(HOMOPHONE_MAP)
+
+def transliterate(text):
+    """Rough Ethiopic-to-Latin transliteration, good enough to compare names."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        row = code & ~7
+        consonant = ETHIOPIC_CONSONANTS.get(row)
+        if consonant is None:
+            out.append(ch)
+            continue
+        vowel = ETHIOPIC_VOWELS[code - row]
+        # First-order h and the vowel carrier read as 'a' (ሀና -> hana, አበበ -> abebe)
+        if code - row == 0 and consonant in ('', 'h'):
+            vowel = 'a'
+        elif not consonant and not vowel:
+            vowel = 'i'  # sixth-order vowel carrier (እ)
+        out.append(consonant + vowel)
+    return ''.join(out)
+
+def normalize_text(text):
+    """Canonical form used as the exact-match key."""
+    text = unicodedata.normalize('NFC', str(text or ''))
+    text = fold_ethiopic(text).lower()
+    text = re.sub(r'[^\w\s]', ' ', text)  # punctuation, including Ethiopic ፡ ። /
+    return re.sub(r'\s+', ' ', text).strip()
+
+def split_artist(title):
+    """Split 'Song (Artist)' into ('Song', 'Artist')."""
+    match = re.match(r'^(.*?)\s*\(([^()]*)\)\s*$', title or '')
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+    return (title or '').strip(), ''
+
+class NameClusterer:
+    """Groups spelling variants of names; add() returns a stable cluster id.
+
+    Exact normalized matches are a dict lookup. Otherwise the name is compared
+    only against clusters whose transliterated key starts with the same letter.
+    """
+
+    def __init__(self, threshold=0.8):
+        self.threshold = threshold
+        self.by_key = {}
+        self.blocks = {}
+        self.variants = []  # cluster id -> Counter of raw spellings
+
+    def _similar(self, a, b):
+        short, long_ = sorted((a, b), key=len)
+        # A title of two or more words followed by a subtitle
+        if ' ' in short and long_.startswith(short + ' '):
+            return True
+        # Compare against the same-length prefix so small typos in a longer title still match
+        ratio = SequenceMatcher(None, short, long_[:len(short) + 2]).ratio()
+        return ratio >= self.threshold and len(short) >= 0.5 * len(long_)
+
+    def add(self, raw):
+        raw = re.sub(r'\s+', ' ', str(raw or '')).strip()
+        key = normalize_text(raw)
+        if not key:
+            return None
+
+        cluster = self.by_key.get(key)
+        if cluster is None:
+            latin = transliterate(key)
+            block = self.blocks.setdefault(latin[:1], [])
+            for other_latin, other_cluster in block:
+                if self._similar(latin, other_latin):
+                    cluster = other_cluster
+                    break
+            else:
+                cluster = len(self.variants)
+                self.variants.append(Counter())
+                block.append((latin, cluster))
+            self.by_key[key] = cluster
+
+        self.variants[cluster][raw] += 1
+        return cluster
+
+    def display_name(self, cluster):
+        """The most common spelling of a cluster."""
+        return self.variants[cluster].most_common(1)[0][0]
+
+def slot_of(row):
+    """Hour slot of an appointment, e.g. '10 AM'."""
+    at = datetime.fromisoformat(row['scheduled_at'])
+    return at.strftime('%I %p').lstrip('0')
+
+def build_index(season, threshold=0.8):
+    """Aggregate songs and singers over the merged season table."""
+    songs = NameClusterer(threshold)
+    singers = NameClusterer(threshold)
+    stats = {'selected': {}, 'additional': {}, 'singer': {}}
+
+    def count(kind, cluster, row):
+        entry = stats[kind].setdefault(cluster, {'total': 0, 'by_day': Counter(), 'by_slot': Counter(),
+                                                 'artists': Counter()})
+        entry['total'] += 1
+        entry['by_day'][row['scheduled_date']] += 1
+        entry['by_slot'][slot_of(row)] += 1
+        return entry
+
+    for row in season:
+        title, artist = split_artist(row['selected_song'])
+        cluster = songs.add(title)
+        if cluster is not None:
+            count('selected', cluster, row)['artists'][artist] += bool(artist)
+
+        singer = singers.add(row['additional_song_singer'])
+        if singer is not None:
+            count('singer', singer, row)
+
+        cluster = songs.add(row['additional_song'])
+        if cluster is not None:
+            entry = count('additional', cluster, row)
+            if singer is not None:
+                entry['artists'][singers.display_name(singer)] += 1
+
+    def export(kind, clusterer):
+        items = []
+        for cluster, entry in stats[kind].items():
+            items.append({
+                'name': clusterer.display_name(cluster),
+                'variants': sorted(clusterer.variants[cluster]),
+                'total': entry['total'],
+                'by_day': dict(sorted(entry['by_day'].items())),
+                'by_slot': dict(entry['by_slot'].most_common()),
+                'artists': [a for a, n in entry['artists'].most_common() if a and n],
+            })
+        items.sort(key=lambda item: (-item['total'], item['name']))
+        return items
+
+    return {
+        'appointments': len(season),
+        'days': sorted(set(row['scheduled_date'] for row in season)),
+        'selected_songs': export('selected', songs),
+        'additional_songs': export('additional', songs),
+        'singers': export('singer', singers),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pattern', nargs='?', default='appointments_*.csv')
+    parser.add_argument('--output', default='song_index.json')
+    parser.add_argument('--threshold', type=float, default=0.8, help='Fuzzy match similarity (0-1)')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    files = sorted(p for p in glob.glob(args.pattern) if not p.endswith('_season.csv'))
+    if not files:
+        print(f"No files match {args.pattern}")
+        return
+    with ProcessPoolExecutor() as pool:
+        season, _, _ = merge_season(list(pool.map(parse_export, files)))
+
+    index = build_index(season, args.threshold)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    for title, key in (('SELECTED SONGS', 'selected_songs'), ('ADDITIONAL SONGS', 'additional_songs'),
+                       ('SINGERS', 'singers')):
+        print("\n" + "=" * 80)
+        print(f"{title} ({len(index[key])} distinct):")
+        print("=" * 80)
+        for item in index[key][:args.top]:
+            days = ', '.join(f'{d}: {n}' for d, n in item['by_day'].items())
+            print(f"{item['total']:4d}  {item['name']}  [{days}]")
+            if len(item['variants']) > 1:
+                print(f"        spellings: {' | '.join(item['variants'])}")
+
+    print(f"\n✅ Created {args.output} from {index['appointments']} appointments over {len(index['days'])} days")
+
+if __name__ == '__main__':
+    main()
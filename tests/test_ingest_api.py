@@ -0,0 +1,130 @@
+"""Tests for ingest_api against a local stub of the backend API."""
+
+import asyncio
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_store import ContactStore
+from ingest_api import ingest, save_checkpoint
+
+APPLICANTS = [{'id': i, 'name': f'Applicant {i}', 'phone': f'09{i:08d}'} for i in range(250)]
+
+class StubApi(BaseHTTPRequestHandler):
+    """Paginated /submissions; `fail` maps a page to how many 503s to return first."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        page = int(query['page'][0])
+        limit = int(query['limit'][0])
+        server = self.server
+        with server.lock:
+            server.requests.append((url.path, page, limit))
+            failing = server.fail.get(page, 0)
+            if failing:
+                server.fail[page] = failing - 1
+
+        if failing:
+            self.reply(503, {'success': False})
+        elif url.path != '/api/submissions':
+            self.reply(404, {'success': False})
+        else:
+            self.reply(200, {
+                'success': True,
+                'submissions': APPLICANTS[(page - 1) * limit:page * limit],
+                'pagination': {'current_page': page, 'total_pages': math.ceil(len(APPLICANTS) / limit)},
+            })
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+class IngestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubApi)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.fail = {}
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.api_url = f'http://127.0.0.1:{self.server.server_address[1]}/api'
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store_file = os.path.join(self.tmp.name, 'store.jsonl')
+        self.checkpoint_file = os.path.join(self.tmp.name, 'checkpoint.json')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def run_ingest(self, page_size=100):
+        return asyncio.run(ingest(['applicants'], self.api_url, None, self.store_file,
+                                  self.checkpoint_file, workers=3, page_size=page_size))
+
+    def stored_ids(self):
+        return sorted(int(r['id']) for r in ContactStore(self.store_file).contacts('applicants'))
+
+    def requested_pages(self):
+        return sorted(page for _, page, _ in self.server.requests)
+
+    def test_fetches_every_page(self):
+        counts = self.run_ingest()
+        self.assertEqual(counts, {'applicants': 250})
+        self.assertEqual(self.stored_ids(), list(range(250)))
+        self.assertEqual(self.requested_pages(), [1, 2, 3])
+
+    def test_resumes_from_partial_checkpoint(self):
+        # Pages 1 and 2 were stored before an interruption
+        ContactStore(self.store_file).append(
+            [{'source': 'applicants', 'id': a['id'], 'name': a['name'], 'phone': a['phone'],
+              'normalized_phone': a['phone']} for a in APPLICANTS[:200]])
+        save_checkpoint(self.checkpoint_file, {
+            'applicants': {'limit': 100, 'done_pages': [1, 2], 'total_pages': 3}})
+
+        counts = self.run_ingest()
+        self.assertEqual(counts, {'applicants': 50})
+        self.assertEqual(self.requested_pages(), [3])
+        self.assertEqual(self.stored_ids(), list(range(250)))
+
+        # A completed source is not fetched again
+        self.server.requests.clear()
+        self.assertEqual(self.run_ingest(), {})
+        self.assertEqual(self.server.requests, [])
+
+    def test_page_size_change_restarts_source(self):
+        save_checkpoint(self.checkpoint_file, {
+            'applicants': {'limit': 50, 'done_pages': [1, 2], 'total_pages': 5}})
+
+        self.run_ingest(page_size=100)
+        self.assertEqual(self.requested_pages(), [1, 2, 3])
+        self.assertTrue(all(limit == 100 for _, _, limit in self.server.requests))
+        self.assertEqual(self.stored_ids(), list(range(250)))
+
+    def test_retries_server_errors(self):
+        self.server.fail = {2: 2}
+        counts = self.run_ingest()
+        self.assertEqual(counts, {'applicants': 250})
+        self.assertEqual(self.requested_pages(), [1, 2, 2, 2, 3])
+
+if __name__ == '__main__':
+    unittest.main()
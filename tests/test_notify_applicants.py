@@ -0,0 +1,113 @@
+"""Tests for notify_applicants.dispatch() against the fake gateway."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notify_applicants import TEMPLATES, FakeGateway, GatewayError, SentLog, dispatch, message_key
+
+def make_contacts(count, category='accepted'):
+    return [{'name': f'Applicant {i}', 'phone': f'+2519{i:08d}', 'category': category} for i in range(count)]
+
+class CountingGateway(FakeGateway):
+    """Fake gateway that also counts send attempts."""
+
+    def __init__(self, **kwargs):
+        super().__init__(latency=0, **kwargs)
+        self.attempts = 0
+
+    async def send(self, phone, message):
+        self.attempts += 1
+        await super().send(phone, message)
+
+class RejectingGateway:
+    async def send(self, phone, message):
+        raise GatewayError('HTTP 401', retryable=False)
+
+class DispatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmp.name, 'sent.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_dispatch(self, contacts, gateway, sent_log, rate=1000, concurrency=4, max_attempts=5):
+        try:
+            return asyncio.run(dispatch(contacts, TEMPLATES, gateway, sent_log, rate, concurrency,
+                                        max_attempts=max_attempts, backoff=0))
+        finally:
+            sent_log.close()
+
+    def test_failures_are_retried_until_delivered(self):
+        gateway = CountingGateway(failure_rate=0.5, seed=1)
+        sent, skipped, failed = self.run_dispatch(make_contacts(20), gateway, SentLog(self.log_path),
+                                                  max_attempts=20)
+        self.assertEqual((len(sent), len(skipped), len(failed)), (20, 0, 0))
+        self.assertEqual(len(gateway.sent), 20)
+        self.assertGreater(gateway.attempts, 20)
+
+    def test_gives_up_after_max_attempts(self):
+        gateway = CountingGateway(failure_rate=1.0, seed=1)
+        sent, _, failed = self.run_dispatch(make_contacts(3), gateway, SentLog(self.log_path), max_attempts=4)
+        self.assertEqual((len(sent), len(failed)), (0, 3))
+        self.assertEqual(gateway.attempts, 12)
+
+    def test_non_retryable_error_is_not_retried(self):
+        sent, _, failed = self.run_dispatch(make_contacts(3), RejectingGateway(), SentLog(self.log_path))
+        self.assertEqual((len(sent), len(failed)), (0, 3))
+        self.assertEqual(os.path.getsize(self.log_path), 0)
+
+    def test_sends_are_throttled_to_rate(self):
+        # The bucket allows a burst of `rate` sends, then `rate` per second
+        start = time.monotonic()
+        sent, _, _ = self.run_dispatch(make_contacts(40), FakeGateway(latency=0), SentLog(self.log_path),
+                                       rate=20, concurrency=8)
+        elapsed = time.monotonic() - start
+        self.assertEqual(len(sent), 40)
+        self.assertGreaterEqual(elapsed, 0.9)
+
+    def test_rerun_does_not_send_again(self):
+        contacts = make_contacts(10)
+        self.run_dispatch(contacts, FakeGateway(latency=0), SentLog(self.log_path))
+
+        gateway = FakeGateway(latency=0)
+        sent, skipped, _ = self.run_dispatch(contacts, gateway, SentLog(self.log_path))
+        self.assertEqual((len(sent), len(skipped)), (0, 10))
+        self.assertEqual(gateway.sent, [])
+
+    def test_dry_run_log_is_not_written(self):
+        contacts = make_contacts(5)
+        sent, _, _ = self.run_dispatch(contacts, FakeGateway(latency=0), SentLog(self.log_path, read_only=True))
+        self.assertEqual(len(sent), 5)
+        self.assertFalse(os.path.exists(self.log_path))
+
+        # A real run afterwards still sends to everyone
+        sent, skipped, _ = self.run_dispatch(contacts, FakeGateway(latency=0), SentLog(self.log_path))
+        self.assertEqual((len(sent), len(skipped)), (5, 0))
+
+    def test_template_change_does_not_resend(self):
+        contacts = make_contacts(3)
+        self.run_dispatch(contacts, FakeGateway(latency=0), SentLog(self.log_path))
+
+        templates = dict(TEMPLATES, accepted='Dear {name}, (typo fixed) welcome!')
+        sent_log = SentLog(self.log_path)
+        try:
+            sent, skipped, _ = asyncio.run(dispatch(contacts, templates, FakeGateway(latency=0), sent_log, 1000, 4))
+        finally:
+            sent_log.close()
+        self.assertEqual((len(sent), len(skipped)), (0, 3))
+
+    def test_message_key_depends_on_category_and_phone(self):
+        contact = {'name': 'A', 'phone': '+251911000000', 'category': 'accepted'}
+        self.assertEqual(message_key(contact), message_key(dict(contact, name='B')))
+        self.assertNotEqual(message_key(contact), message_key(dict(contact, category='rejected')))
+
+if __name__ == '__main__':
+    unittest.main()
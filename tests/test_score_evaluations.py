@@ -0,0 +1,120 @@
+"""Tests for the judge normalization and cut-off in score_evaluations."""
+
+import csv
+import math
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from score_evaluations import Ratings, applicant_scores, decide, judge_stats, load_ratings, zscores
+
+def make_ratings(rows):
+    ratings = Ratings()
+    for appointment_id, judge, criterion, rating in rows:
+        ratings.add(appointment_id, judge, criterion, rating)
+    return ratings
+
+def scores_by_id(ratings):
+    _, means, stds = judge_stats(ratings)
+    return {item['appointment_id']: item for item in applicant_scores(ratings, zscores(ratings, means, stds))}
+
+class NormalizationTest(unittest.TestCase):
+
+    def test_judge_stats(self):
+        ratings = make_ratings([('1', 'A', 'voice', 2), ('2', 'A', 'voice', 4), ('1', 'B', 'voice', 5)])
+        counts, means, stds = judge_stats(ratings)
+        self.assertEqual(counts, [2, 1])
+        self.assertEqual(means, [3.0, 5.0])
+        self.assertEqual(stds, [1.0, 0.0])
+
+    def test_strict_and_generous_judges_score_alike(self):
+        # A rates everyone two points lower than B, in the same order
+        ratings = make_ratings([('1', 'A', 'voice', 1), ('2', 'A', 'voice', 3), ('3', 'A', 'voice', 2),
+                                ('4', 'B', 'voice', 3), ('5', 'B', 'voice', 5), ('6', 'B', 'voice', 4)])
+        scores = scores_by_id(ratings)
+        for strict, generous in (('1', '4'), ('2', '5'), ('3', '6')):
+            self.assertAlmostEqual(scores[strict]['score'], scores[generous]['score'])
+        self.assertAlmostEqual(scores['3']['score'], 0.0)
+        self.assertEqual(scores['5']['raw_mean'], 5.0)
+
+    def test_judge_with_one_value_scores_zero(self):
+        ratings = make_ratings([('1', 'A', 'voice', 4), ('2', 'A', 'voice', 4)])
+        _, means, stds = judge_stats(ratings)
+        self.assertEqual(list(zscores(ratings, means, stds)), [0.0, 0.0])
+
+    def test_criteria_weigh_equally(self):
+        # voice is rated by two judges, pitch by one; each criterion counts once
+        ratings = make_ratings([('1', 'A', 'voice', 5), ('1', 'B', 'voice', 5), ('1', 'A', 'pitch', 1),
+                                ('2', 'A', 'voice', 1), ('2', 'B', 'voice', 1), ('2', 'A', 'pitch', 5)])
+        scores = scores_by_id(ratings)
+        self.assertAlmostEqual(scores['1']['score'], scores['2']['score'])
+        self.assertEqual((scores['1']['judges'], scores['1']['criteria']), (2, 2))
+
+class DecideTest(unittest.TestCase):
+
+    def ranked(self):
+        return [{'appointment_id': str(i), 'score': score, 'judges': judges}
+                for i, (score, judges) in enumerate([(1.5, 2), (1.0, 1), (0.5, 2), (-0.2, 3), (-1.0, 2)])]
+
+    def decisions(self, **kwargs):
+        return [item['decision'] for item in decide(self.ranked(), **kwargs)]
+
+    def test_accept_top_skips_pending(self):
+        self.assertEqual(self.decisions(accept_top=2, min_judges=2),
+                         ['accepted', 'pending', 'accepted', 'rejected', 'rejected'])
+
+    def test_accept_fraction_of_eligible(self):
+        # 4 eligible applicants, half of them accepted
+        self.assertEqual(self.decisions(accept_fraction=0.5, min_judges=2),
+                         ['accepted', 'pending', 'accepted', 'rejected', 'rejected'])
+
+    def test_min_score(self):
+        self.assertEqual(self.decisions(min_score=0.0),
+                         ['accepted', 'accepted', 'accepted', 'rejected', 'rejected'])
+
+    def test_cut_offs_combine(self):
+        self.assertEqual(self.decisions(accept_top=4, min_score=0.8),
+                         ['accepted', 'accepted', 'rejected', 'rejected', 'rejected'])
+
+class LoadRatingsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'evaluations.csv')
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['appointment_id', 'judge_name', 'criteria_name', 'rating'])
+            writer.writerows([
+                ['1', 'A', 'voice', '4'], ['1', 'A', 'pitch', '0'],  # a deliberate 0
+                ['2', 'A', 'voice', '0'], ['2', 'A', 'pitch', '0'],  # an untouched form
+                ['2', 'B', 'voice', '3'], ['2', 'B', 'pitch', '2'],
+                ['3', 'B', 'voice', 'n/a'],
+            ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def cells(self, ratings):
+        return {(ratings.appointments[a], ratings.judges[j], ratings.criteria[c]): value
+                for a, j, c, value in zip(ratings.app_codes, ratings.judge_codes,
+                                          ratings.criteria_codes, ratings.values)}
+
+    def test_only_all_zero_submissions_are_left_out(self):
+        ratings, skipped, empty = load_ratings([self.path])
+        self.assertEqual((skipped, empty), (1, 1))
+        cells = self.cells(ratings)
+        self.assertEqual(cells[('1', 'A', 'pitch')], 0.0)
+        self.assertNotIn(('2', 'A', 'voice'), cells)
+        self.assertEqual(len(ratings), 4)
+
+    def test_keep_empty_submissions(self):
+        ratings, _, empty = load_ratings([self.path], skip_empty=False)
+        self.assertEqual(empty, 1)
+        self.assertEqual(len(ratings), 6)
+        self.assertFalse(any(math.isnan(value) for value in ratings.values))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests for merging appointment exports into the season table."""
+
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from season_batch import merge_season, parse_export, sort_exports
+
+HEADER = ['id', 'applicant_name', 'applicant_phone', 'scheduled_date', 'scheduled_time']
+
+class MergeSeasonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_export(self, name, rows):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            writer.writerows(rows)
+        return path
+
+    def test_exports_are_ordered_by_date_in_name(self):
+        paths = [self.write_export(name, []) for name in
+                 ('appointments_dec02_2025.csv', 'appointments_nov18_2025.csv', 'appointments_nov28_2025.csv')]
+        self.assertEqual([os.path.basename(p) for p in sort_exports(paths)],
+                         ['appointments_nov18_2025.csv', 'appointments_nov28_2025.csv', 'appointments_dec02_2025.csv'])
+
+    def test_latest_export_wins(self):
+        paths = [
+            self.write_export('appointments_nov18_2025.csv', [['337', 'A', '0943000001', '2025-11-18', '10:00 AM']]),
+            self.write_export('appointments_nov28_2025.csv', [['337', 'A', '0943000001', '2025-11-28', '10:00 AM']]),
+            self.write_export('appointments_dec02_2025.csv', [['337', 'A', '0943000001', '2025-12-02', '09:00 AM']]),
+        ]
+        # Alphabetical order would put dec02 first and keep nov28
+        for order in (sorted(paths), list(reversed(paths))):
+            season, duplicate_ids, _ = merge_season([parse_export(p) for p in order])
+            self.assertEqual([row['scheduled_date'] for row in season], ['2025-12-02'])
+            self.assertEqual(duplicate_ids, 2)
+
+    def test_same_day_bookings_match_on_national_number(self):
+        path = self.write_export('appointments_nov18_2025.csv', [
+            ['5', 'B', '+2510943000002', '2025-11-18', '11:00 AM'],
+            ['6', 'B', '0943000002', '2025-11-18', '12:00 PM'],
+        ])
+        season, _, duplicate_bookings = merge_season([parse_export(path)])
+        self.assertEqual([row['id'] for row in season], ['5'])
+        self.assertEqual(season[0]['normalized_phone'], '+251943000002')
+        self.assertEqual(duplicate_bookings, 1)
+
+    def test_numeric_ids_sort_as_numbers(self):
+        path = self.write_export('appointments_nov18_2025.csv', [
+            ['10', 'A', '0943000001', '2025-11-18', '10:00 AM'],
+            ['9', 'B', '0943000002', '2025-11-18', '10:00 AM'],
+        ])
+        season, _, _ = merge_season([parse_export(path)])
+        self.assertEqual([row['id'] for row in season], ['9', '10'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Script to keep the VCF files up to date while the admin re-exports CSVs.
+
+Polls the input files, waits for a burst of writes to settle (an export is
+often written in several chunks), and then reruns only the generators that
+read the changed file. Files whose content did not actually change (a plain
+re-save) are ignored. Generators run in this process, so a regeneration takes
+milliseconds rather than a fresh interpreter per script.
+
+Usage:
+    python watch_vcf.py [--interval 0.2] [--debounce 0.3] [--once]
+"""
+
+import argparse
+import hashlib
+import importlib
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+# input file -> generator modules that read it (the rejected list is embedded
+# in create_rejected_vcf.py itself)
+GENERATORS = {
+    'accepted_list.csv': ['create_vcf_groups'],
+    'accepted_list_decision.csv': ['create_complete_vcf'],
+    'create_rejected_vcf.py': ['create_rejected_vcf'],
+}
+
+def file_state(path):
+    """Cheap change signal for a file: (mtime_ns, size), or None if missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def run_generator(name):
+    """Run a generator's main() in-process and return its last output line."""
+    module = sys.modules.get(name)
+    # Reload so edits to the script (or its embedded data) are picked up
+    module = importlib.reload(module) if module else importlib.import_module(name)
+    output = io.StringIO()
+    # Generators parse their own command line; give them none of ours
+    argv, sys.argv = sys.argv, [name]
+    try:
+        with redirect_stdout(output):
+            module.main()
+    finally:
+        sys.argv = argv
+    lines = [line for line in output.getvalue().splitlines() if line.strip()]
+    return lines[-1] if lines else ''
+
+class Watcher:
+    """Polls input files and regenerates the outputs of those that changed."""
+
+    def __init__(self, generators, debounce=0.3):
+        self.generators = generators
+        self.debounce = debounce
+        self.states = {path: file_state(path) for path in generators}
+        self.digests = {path: file_digest(path) for path in generators if self.states[path]}
+        self.pending = {}  # path -> time of the last change seen
+
+    def poll(self):
+        """Check every input once; return the inputs that settled after a change."""
+        now = time.monotonic()
+        for path in self.generators:
+            state = file_state(path)
+            if state != self.states[path]:
+                self.states[path] = state
+                self.pending[path] = now
+
+        settled = [p for p, changed_at in self.pending.items() if now - changed_at >= self.debounce]
+        changed = []
+        for path in settled:
+            del self.pending[path]
+            if self.states[path] is None:
+                continue
+            digest = file_digest(path)
+            if digest != self.digests.get(path):
+                self.digests[path] = digest
+                changed.append(path)
+        return changed
+
+    def regenerate(self, paths):
+        """Run each affected generator once, even if several inputs changed."""
+        names = []
+        for path in paths:
+            for name in self.generators[path]:
+                if name not in names:
+                    names.append(name)
+
+        for name in names:
+            start = time.perf_counter()
+            try:
+                summary = run_generator(name)
+            except Exception as e:
+                print(f"  ⚠️  {name} failed: {e}")
+                continue
+            print(f"  {name}: {summary} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interval', type=float, default=0.2, help='Seconds between polls')
+    parser.add_argument('--debounce', type=float, default=0.3, help='Quiet time before regenerating')
+    parser.add_argument('--once', action='store_true', help='Regenerate everything once and exit')
+    args = parser.parse_args()
+
+    watcher = Watcher(GENERATORS, args.debounce)
+    if args.once:
+        watcher.regenerate(list(GENERATORS))
+        return
+
+    print(f"Watching {', '.join(GENERATORS)} (Ctrl+C to stop)")
+    try:
+        while True:
+            changed = watcher.poll()
+            if changed:
+                print(f"\n[{time.strftime('%H:%M:%S')}] Changed: {', '.join(changed)}")
+                watcher.regenerate(changed)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+if __name__ == '__main__':
+    main()